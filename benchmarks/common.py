@@ -0,0 +1,48 @@
+"""Общая подготовка окружения Django для бенчмарков.
+
+Бенчмарки запускаются из корня репозитория, например:
+
+    python benchmarks/pagination.py
+"""
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import django
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'blogicum'
+
+
+def configure_django():
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+    django.setup()
+
+    from django.conf import settings
+
+    # Построчный лог SQL-статистики искажает замеры и засоряет вывод.
+    settings.BLOG_SQL_INSTRUMENTATION = False
+
+
+def setup_django(sqlite_test_name=None):
+    configure_django()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    if sqlite_test_name and connection.vendor == 'sqlite':
+        connection.settings_dict['TEST']['NAME'] = sqlite_test_name
+    connection.creation.create_test_db(verbosity=0)
+    return connection
+
+
+def timeit(func, repeat=20):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
@@ -0,0 +1,106 @@
+"""Запросов в секунду к ленте с переиспользованием соединений и без.
+
+Профили: no-reuse (CONN_MAX_AGE=0), persistent (CONN_MAX_AGE и
+CONN_HEALTH_CHECKS) и pool — если в настройках PostgreSQL включён
+OPTIONS['pool']. Кеш страниц отключается, чтобы каждый запрос шёл в базу.
+Для PostgreSQL запускайте с DJANGO_SETTINGS_MODULE=
+blogicum.settings_production.
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from wsgiref.util import setup_testing_defaults
+
+from common import setup_django
+
+
+def get_profiles(options):
+    base_options = {
+        key: value for key, value in options.items() if key != 'pool'
+    }
+    profiles = {
+        'no-reuse': {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False,
+                     'OPTIONS': base_options},
+        'persistent': {'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': True,
+                       'OPTIONS': base_options},
+    }
+    if 'pool' in options:
+        profiles['pool'] = {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False,
+                            'OPTIONS': options}
+    return profiles
+
+
+def seed(total):
+    from django.utils import timezone
+
+    from blog.models import Category, Post, User
+
+    author = User.objects.create(username='bench')
+    category = Category.objects.create(
+        title='Бенчмарк', description='Бенчмарк', slug='bench'
+    )
+    Post.objects.bulk_create(
+        Post(
+            title=f'Пост {i}', text='Текст', author=author,
+            category=category, pub_date=timezone.now()
+        )
+        for i in range(total)
+    )
+
+
+def measure(handler, requests):
+    # Тестовый Client отключает закрытие соединений в конце запроса,
+    # поэтому запросы проходят через настоящий WSGI-обработчик.
+    def request():
+        environ = {'PATH_INFO': '/', 'REQUEST_METHOD': 'GET'}
+        setup_testing_defaults(environ)
+        response = handler(environ, lambda status, headers: None)
+        b''.join(response)
+        response.close()
+
+    request()
+    start = time.perf_counter()
+    for _ in range(requests):
+        request()
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+
+    # Соединение с SQLite в памяти Django никогда не закрывает, поэтому
+    # тестовая база должна лежать в файле.
+    directory = tempfile.mkdtemp()
+    setup_django(sqlite_test_name=os.path.join(directory, 'bench.sqlite3'))
+
+    from django.conf import settings
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connections
+
+    settings.BLOG_PAGE_CACHE_TIMEOUT = 0
+    settings.BLOG_COUNT_CACHE_TIMEOUT = 0
+    settings.BLOG_POST_CARD_CACHE_TIMEOUT = 0
+    seed(args.posts)
+    database = settings.DATABASES['default']
+    handler = WSGIHandler()
+    results = []
+    for name, profile in get_profiles(dict(database['OPTIONS'])).items():
+        connections.close_all()
+        database.update(profile)
+        results.append({
+            'profile': name,
+            'requests_per_sec': round(measure(handler, args.requests), 1),
+        })
+    connections.close_all()
+    shutil.rmtree(directory)
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+r"""Нагрузочный прогон основных страниц блога.
+
+По умолчанию создаёт тестовую базу и заполняет её командой
+seed_benchmark; с --no-seed работает с базой из настроек, заранее
+заполненной, например:
+
+    python blogicum/manage.py seed_benchmark --posts 1_000_000 \\
+        --comments 10_000_000 --users 100_000
+    python benchmarks/load.py --no-seed
+
+Для каждой страницы выводит p50/p95/p99 задержки в миллисекундах,
+запросы в секунду и среднее число SQL-запросов в JSON, пригодном для
+сравнения между прогонами.
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+
+from common import configure_django, setup_django
+
+
+def get_targets(rng, samples):
+    from blog.management.commands.seed_benchmark import USERNAME_PREFIX
+    from blog.models import Category, User
+    from blog.views import posts_handler
+
+    posts = list(posts_handler(select_related=False).values_list(
+        'pk', flat=True
+    )[:samples])
+    categories = list(Category.objects.filter(
+        is_published=True
+    ).values_list('slug', flat=True))
+    usernames = list(User.objects.filter(
+        username__startswith=USERNAME_PREFIX
+    ).values_list('username', flat=True)[:samples])
+    return {
+        'index': lambda: ('get', '/', None),
+        'category': lambda: (
+            'get', f'/category/{rng.choice(categories)}/', None
+        ),
+        'profile': lambda: (
+            'get', f'/profile/{rng.choice(usernames)}/', None
+        ),
+        'detail': lambda: ('get', f'/posts/{rng.choice(posts)}/', None),
+        'comment': lambda: (
+            'post', f'/posts/{rng.choice(posts)}/comment/',
+            {'text': 'Комментарий из нагрузочного теста'}
+        ),
+    }, usernames[0]
+
+
+def run(client, make_request, requests):
+    from django.db import connections
+    from django.test.utils import CaptureQueriesContext
+
+    latencies, queries = [], []
+    for _ in range(requests):
+        method, url, data = make_request()
+        with CaptureQueriesContext(connections['default']) as context:
+            start = time.perf_counter()
+            getattr(client, method)(url, data)
+            latencies.append((time.perf_counter() - start) * 1000)
+        queries.append(len(context.captured_queries))
+    percentiles = statistics.quantiles(latencies, n=100)
+    return {
+        'p50_ms': round(percentiles[49], 2),
+        'p95_ms': round(percentiles[94], 2),
+        'p99_ms': round(percentiles[98], 2),
+        'rps': round(len(latencies) / (sum(latencies) / 1000), 1),
+        'queries_per_request': round(statistics.mean(queries), 2),
+    }
+
+
+def prepare(args):
+    if args.no_seed:
+        configure_django()
+        from django.test.utils import setup_test_environment
+
+        setup_test_environment()
+        return
+    setup_django()
+    from django.core.management import call_command
+
+    call_command(
+        'seed_benchmark', users=args.users, posts=args.posts,
+        comments=args.comments, seed=args.seed, stdout=sys.stderr
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--no-seed', action='store_true')
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--posts', type=int, default=5000)
+    parser.add_argument('--comments', type=int, default=20_000)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help='Отключить кеш страниц, счётчиков и карточек.'
+    )
+    args = parser.parse_args()
+    prepare(args)
+
+    from django.conf import settings
+    from django.test import Client
+
+    from blog.models import User
+
+    if args.no_cache:
+        settings.BLOG_PAGE_CACHE_TIMEOUT = 0
+        settings.BLOG_COUNT_CACHE_TIMEOUT = 0
+        settings.BLOG_POST_CARD_CACHE_TIMEOUT = 0
+        settings.BLOG_LOOKUP_CACHE_TIMEOUT = 0
+    rng = random.Random(args.seed)
+    targets, username = get_targets(rng, args.requests)
+    anonymous, author = Client(), Client()
+    author.force_login(User.objects.get(username=username))
+    print(json.dumps(
+        [
+            {'endpoint': name, **run(
+                author if name == 'comment' else anonymous,
+                make_request, args.requests
+            )}
+            for name, make_request in targets.items()
+        ],
+        ensure_ascii=False, indent=2
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Сравнение offset- и cursor-пагинации ленты на разной глубине.
+
+Время offset-страницы растёт с её номером. Время cursor-страницы должно
+оставаться постоянным: если на самой глубокой странице оно больше, чем
+на первой, в --max-growth раз, бенчмарк завершается с ошибкой.
+"""
+import argparse
+import json
+import sys
+from datetime import timedelta
+
+from common import setup_django, timeit
+
+
+def seed(total):
+    from django.utils import timezone
+
+    from blog.models import Category, Post, User
+
+    author = User.objects.create(username='bench')
+    category = Category.objects.create(
+        title='Бенчмарк', description='Бенчмарк', slug='bench'
+    )
+    now = timezone.now()
+    Post.objects.bulk_create(
+        (
+            Post(
+                title=f'Пост {i}', text='Текст', author=author,
+                category=category, pub_date=now - timedelta(minutes=i)
+            )
+            for i in range(total)
+        ),
+        batch_size=1000
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=50_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--max-growth', type=float, default=2.0)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.core.paginator import Paginator
+
+    from blog.models import Post
+    from blog.paginators import CursorPaginator
+    from blog.views import PAGINATE, get_feed_until, posts_handler
+
+    seed(args.posts)
+    queryset = posts_handler()
+    ordered = list(
+        Post.objects.order_by('-pub_date', '-pk').only('pub_date')
+    )
+    paginator = Paginator(queryset, PAGINATE)
+    results = []
+    for number in (1, 10, 100, 1000, paginator.num_pages):
+        if number > paginator.num_pages:
+            continue
+        cursor = None
+        if number > 1:
+            cursor = CursorPaginator(queryset, PAGINATE).encode_cursor(
+                ordered[(number - 1) * PAGINATE - 1]
+            )
+        # Как в представлениях: курсор задаёт верхнюю границу ленты.
+        cursor_paginator = CursorPaginator(
+            posts_handler(until=get_feed_until(cursor)), PAGINATE
+        )
+        results.append({
+            'page': number,
+            'offset_ms': round(timeit(
+                lambda: list(paginator.page(number)), args.repeat
+            ), 3),
+            'cursor_ms': round(timeit(
+                lambda: list(cursor_paginator.page(cursor)), args.repeat
+            ), 3),
+        })
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    growth = results[-1]['cursor_ms'] / results[0]['cursor_ms']
+    if growth > args.max_growth:
+        sys.exit(
+            f'Cursor-страница {results[-1]["page"]} медленнее первой '
+            f'в {growth:.1f} раза: стоимость растёт с глубиной.'
+        )
+
+
+if __name__ == '__main__':
+    main()
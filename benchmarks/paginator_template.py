@@ -0,0 +1,45 @@
+"""Время рендера includes/paginator.html в зависимости от числа страниц.
+
+Благодаря окну вокруг текущей страницы время рендера и размер HTML
+не должны расти вместе с числом страниц.
+"""
+import argparse
+import json
+
+from common import setup_django, timeit
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.template.loader import get_template
+
+    from blog.paginators import CachedCountPaginator
+    from blog.views import PAGINATE
+
+    template = get_template('includes/paginator.html')
+    results = []
+    for num_pages in (10, 100, 1000, 10_000, 100_000):
+        paginator = CachedCountPaginator(
+            range(num_pages * PAGINATE), PAGINATE
+        )
+        page = paginator.page(num_pages // 2)
+        context = {'page_obj': page}
+        html = template.render(context)
+        results.append({
+            'pages': num_pages,
+            'links': html.count('<li'),
+            'html_bytes': len(html.encode()),
+            'render_ms': round(timeit(
+                lambda: template.render(context), args.repeat
+            ), 3),
+        })
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
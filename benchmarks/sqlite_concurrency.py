@@ -0,0 +1,129 @@
+"""Конкурентная нагрузка на SQLite: N пишущих и M читающих потоков.
+
+Сравнивает настройки SQLite по умолчанию с профилем SQLITE_OPTIONS из
+settings.py: число операций в секунду и ошибок «database is locked».
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import django
+
+from common import PROJECT_DIR
+
+
+def prepare_database(profile):
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connection, connections
+    from django.utils import timezone
+
+    from blog.models import Category, Post, User
+
+    connections.close_all()
+    handle, path = tempfile.mkstemp(suffix='.sqlite3')
+    os.close(handle)
+    settings.DATABASES['default'].update(
+        NAME=path,
+        OPTIONS=settings.SQLITE_OPTIONS if profile == 'tuned' else {},
+    )
+    call_command('migrate', verbosity=0)
+    author = User.objects.create(username=f'bench-{profile}')
+    category = Category.objects.create(
+        title='Бенчмарк', description='Бенчмарк', slug='bench'
+    )
+    post = Post.objects.create(
+        title='Пост', text='Текст', author=author, category=category,
+        pub_date=timezone.now()
+    )
+    connection.close()
+    return path, author, post
+
+
+def hammer(operations, duration):
+    from django.db import OperationalError, connection
+
+    stats = {'errors': 0, **{key: 0 for key, _, _ in operations}}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def loop(key, operation):
+        while time.perf_counter() < deadline:
+            try:
+                operation()
+                outcome = key
+            except OperationalError:
+                outcome = 'errors'
+            with lock:
+                stats[outcome] += 1
+        connection.close()
+
+    threads = [
+        threading.Thread(target=loop, args=(key, operation))
+        for key, operation, amount in operations
+        for _ in range(amount)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return stats
+
+
+def run_profile(profile, writers, readers, duration):
+    from django.db import transaction
+
+    from blog.models import Comment
+    from blog.views import posts_handler
+
+    path, author, post = prepare_database(profile)
+
+    def write():
+        with transaction.atomic():
+            Comment.objects.create(
+                text='Комментарий', author=author, post=post
+            )
+
+    def read():
+        list(posts_handler()[:10])
+
+    stats = hammer(
+        [('writes', write, writers), ('reads', read, readers)], duration
+    )
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return {
+        'profile': profile,
+        'writes_per_sec': round(stats['writes'] / duration, 1),
+        'reads_per_sec': round(stats['reads'] / duration, 1),
+        'errors': stats['errors'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=5.0)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+    django.setup()
+
+    print(json.dumps(
+        [
+            run_profile(profile, args.writers, args.readers, args.duration)
+            for profile in ('default', 'tuned')
+        ],
+        ensure_ascii=False, indent=2
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,9 @@
 from django.contrib import admin
-from .models import Category, Comment, Location, Post
+from .models import Category, Comment, Job, Location, Post
 
 
 admin.site.register(Category)
 admin.site.register(Comment)
+admin.site.register(Job)
 admin.site.register(Location)
 admin.site.register(Post)
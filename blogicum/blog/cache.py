@@ -0,0 +1,79 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import get_object_or_404
+
+from blog.routers import reads_from_replicas
+
+POSTS_SCOPE = 'posts'
+PAGES_SCOPE = 'pages'
+USERS_SCOPE = 'users'
+CATEGORIES_SCOPE = 'categories'
+
+
+def version_key(scope):
+    return f'blog:version:{scope}'
+
+
+def get_versions(scopes):
+    keys = {version_key(scope): scope for scope in scopes}
+    versions = cache.get_many(keys)
+    for key in keys.keys() - versions.keys():
+        cache.add(key, time.time_ns(), None)
+        versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_versions(*scopes):
+    for scope in scopes:
+        try:
+            cache.incr(version_key(scope))
+        except ValueError:
+            cache.set(version_key(scope), time.time_ns(), None)
+
+
+def make_key(prefix, *parts, scopes=(POSTS_SCOPE,)):
+    return ':'.join(
+        ['blog', prefix]
+        + [str(version) for version in get_versions(scopes)]
+        + ['' if part is None else str(part) for part in parts]
+    )
+
+
+def index_scope():
+    return f'{PAGES_SCOPE}:index'
+
+
+def category_scope(slug):
+    return f'{PAGES_SCOPE}:category:{slug}'
+
+
+def profile_scope(username):
+    return f'{PAGES_SCOPE}:profile:{username}'
+
+
+def get_timeout(setting, default=0):
+    """Возвращает время жизни записей кеша из настройки `setting`.
+
+    Версии кеша сбрасываются в основной базе, а реплика может ещё
+    отдавать старые данные. Записи, собранные по данным с реплик,
+    живут не дольше BLOG_REPLICA_STICKY_SECONDS — допустимого отставания.
+    """
+    timeout = getattr(settings, setting, default)
+    if timeout and reads_from_replicas():
+        timeout = min(
+            timeout, getattr(settings, 'BLOG_REPLICA_STICKY_SECONDS', 10)
+        )
+    return timeout
+
+
+def get_cached_object(queryset, key, **lookup):
+    timeout = get_timeout('BLOG_LOOKUP_CACHE_TIMEOUT')
+    if not timeout:
+        return get_object_or_404(queryset, **lookup)
+    obj = cache.get(key)
+    if obj is None:
+        obj = get_object_or_404(queryset, **lookup)
+        cache.set(key, obj, timeout)
+    return obj
@@ -0,0 +1,14 @@
+from django.utils.functional import SimpleLazyObject
+
+from blog.cache import PAGES_SCOPE, get_timeout, get_versions
+
+
+def post_card_cache(request):
+    return {
+        'post_card_cache_timeout': get_timeout(
+            'BLOG_POST_CARD_CACHE_TIMEOUT'
+        ),
+        'post_card_cache_version': SimpleLazyObject(
+            lambda: get_versions([PAGES_SCOPE])[0]
+        ),
+    }
@@ -1,5 +1,7 @@
 from django import forms
+from django.contrib.auth.forms import PasswordResetForm
 
+from .jobs import enqueue
 from .models import Comment, Post, User
 
 
@@ -20,3 +22,26 @@ class CommentForm(forms.ModelForm):
     class Meta:
         model = Comment
         fields = ('text',)
+
+
+class QueuedPasswordResetForm(PasswordResetForm):
+    def send_mail(self, subject_template_name, email_template_name,
+                  context, from_email, to_email,
+                  html_email_template_name=None):
+        # uid и токен дают доступ к аккаунту, поэтому в очередь они не
+        # попадают и создаются заново при отправке письма.
+        user = context['user']
+        context = {
+            key: value for key, value in context.items()
+            if key not in ('user', 'uid', 'token')
+        }
+        enqueue(
+            'blog.send_password_reset',
+            user_id=user.pk,
+            context=context,
+            subject_template_name=subject_template_name,
+            email_template_name=email_template_name,
+            from_email=from_email,
+            to_email=to_email,
+            html_email_template_name=html_email_template_name,
+        )
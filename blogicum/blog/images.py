@@ -0,0 +1,140 @@
+from io import BytesIO
+from itertools import groupby
+from operator import itemgetter
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import ExifTags, Image, ImageOps
+
+MIME_TYPES = {
+    'webp': 'image/webp',
+    'avif': 'image/avif',
+}
+
+
+def get_thumbnail_widths():
+    return getattr(settings, 'BLOG_THUMBNAIL_WIDTHS', (320, 640, 1280))
+
+
+def get_image_formats():
+    Image.init()
+    return tuple(
+        image_format
+        for image_format in getattr(settings, 'BLOG_IMAGE_FORMATS', ())
+        if image_format.upper() in Image.SAVE
+    )
+
+
+def get_image_quality(image_format):
+    return getattr(settings, 'BLOG_IMAGE_QUALITY', {}).get(image_format, 85)
+
+
+def get_thumbnail_name(name, width, image_format=None):
+    path = PurePosixPath(name)
+    suffix = f'.{image_format}' if image_format else path.suffix
+    return str(path.with_name(f'{path.stem}_{width}w{suffix}'))
+
+
+def get_thumbnail_names(image, image_format=None):
+    return {
+        width: get_thumbnail_name(image.name, width, image_format)
+        for width in get_thumbnail_widths()
+    }
+
+
+def get_image_width(image):
+    """Возвращает ширину изображения с учётом поворота из EXIF."""
+    with image.open('rb'):
+        source = Image.open(image)
+        width, height = source.size
+        orientation = source.getexif().get(ExifTags.Base.Orientation)
+    return height if orientation in (5, 6, 7, 8) else width
+
+
+def get_variants(image, source_width):
+    for image_format in (None, *get_image_formats()):
+        names = get_thumbnail_names(image, image_format)
+        if image_format:
+            # Оригинал перекодируется в современный формат в полном
+            # размере, поэтому у каждого <picture> есть такой источник.
+            names[source_width] = get_thumbnail_name(
+                image.name, source_width, image_format
+            )
+        for width, name in names.items():
+            if width < source_width or (
+                image_format and width == source_width
+            ):
+                yield image_format, width, name
+
+
+def save_variant(storage, name, data):
+    if hasattr(storage, 'save_derived'):
+        return storage.save_derived(name, ContentFile(data))
+    if storage.exists(name):
+        storage.delete(name)
+    return storage.save(name, ContentFile(data))
+
+
+def encode_image(image, image_format):
+    buffer = BytesIO()
+    image.save(
+        buffer, format=image_format,
+        quality=get_image_quality(image_format.lower())
+    )
+    return buffer.getvalue()
+
+
+def make_thumbnails(image, force=False):
+    storage = image.storage
+    if not storage.exists(image.name):
+        return []
+    missing = [
+        (image_format, width, name)
+        for image_format, width, name in get_variants(
+            image, get_image_width(image)
+        )
+        if force or not storage.exists(name)
+    ]
+    if not missing:
+        return []
+    with image.open('rb'):
+        source = Image.open(image)
+        source_format = source.format
+        source = ImageOps.exif_transpose(source)
+    created = []
+    missing.sort(key=itemgetter(1))
+    for width, variants in groupby(missing, key=itemgetter(1)):
+        # Масштабируем один раз на ширину и кодируем во все форматы.
+        thumbnail = source if width == source.width else source.resize(
+            (width, round(source.height * width / source.width)),
+            Image.Resampling.LANCZOS
+        )
+        for image_format, _, name in variants:
+            data = encode_image(thumbnail, image_format or source_format)
+            created.append(save_variant(storage, name, data))
+    return created
+
+
+def get_image_sources(image):
+    """Возвращает srcset изображения по форматам.
+
+    Ключ None соответствует исходному формату; в srcset попадают только
+    уже созданные копии: уменьшенные, а для современных форматов ещё и
+    копия в полном размере.
+    """
+    if not image or not image.storage.exists(image.name):
+        return {}
+    storage = image.storage
+    sources = {}
+    for image_format, width, name in get_variants(
+        image, get_image_width(image)
+    ):
+        if storage.exists(name):
+            sources.setdefault(image_format, []).append(
+                f'{storage.url(name)} {width}w'
+            )
+    return {
+        image_format: ', '.join(srcset)
+        for image_format, srcset in sources.items()
+    }
@@ -0,0 +1,94 @@
+import logging
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from blog.models import Job
+
+logger = logging.getLogger(__name__)
+
+TASKS = {}
+
+
+def task(name):
+    def register(func):
+        TASKS[name] = func
+        return func
+    return register
+
+
+def enqueue(name, **kwargs):
+    if name not in TASKS:
+        raise KeyError(f'Неизвестная задача: {name}')
+    if getattr(settings, 'BLOG_JOBS_EAGER', False):
+        TASKS[name](**kwargs)
+        return None
+    return Job.objects.create(name=name, kwargs=kwargs)
+
+
+def get_claimable():
+    """Задачи в очереди и задачи, чей обработчик перестал отвечать.
+
+    Задача в статусе RUNNING дольше BLOG_JOBS_LEASE секунд считается
+    брошенной (например, процесс обработчика был убит) и выдаётся снова.
+    """
+    stale = timezone.now() - timedelta(
+        seconds=getattr(settings, 'BLOG_JOBS_LEASE', 600)
+    )
+    return Job.objects.filter(
+        Q(status=Job.PENDING) | Q(status=Job.RUNNING, claimed_at__lt=stale)
+    )
+
+
+def claim_job():
+    claimable = get_claimable()
+    claimable.filter(
+        status=Job.RUNNING,
+        attempts__gte=getattr(settings, 'BLOG_JOBS_MAX_ATTEMPTS', 3)
+    ).update(
+        status=Job.FAILED, error='Обработчик задачи не завершил работу.',
+        finished_at=timezone.now()
+    )
+    for job_id in claimable.values_list('pk', flat=True)[:10]:
+        claimed = get_claimable().filter(pk=job_id).update(
+            status=Job.RUNNING, attempts=F('attempts') + 1,
+            claimed_at=timezone.now()
+        )
+        if claimed:
+            return Job.objects.get(pk=job_id)
+    return None
+
+
+def run_job(job):
+    try:
+        TASKS[job.name](**job.kwargs)
+    except Exception:
+        logger.exception('Задача %s #%s завершилась ошибкой', job.name, job.pk)
+        job.error = traceback.format_exc()
+        job.status = (
+            Job.PENDING
+            if job.attempts < getattr(settings, 'BLOG_JOBS_MAX_ATTEMPTS', 3)
+            else Job.FAILED
+        )
+    else:
+        job.error = ''
+        job.status = Job.DONE
+    job.finished_at = timezone.now()
+    job.save(update_fields=('status', 'error', 'finished_at'))
+
+
+def work(once=False, sleep=1.0):
+    processed = 0
+    while True:
+        job = claim_job()
+        if job is None:
+            if once:
+                return processed
+            time.sleep(sleep)
+            continue
+        run_job(job)
+        processed += 1
@@ -0,0 +1,204 @@
+import bz2
+import gzip
+import time
+from collections import Counter, defaultdict
+
+from django.apps import apps
+from django.core import serializers
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models.constants import OnConflict
+
+from blog.cache import (
+    CATEGORIES_SCOPE,
+    PAGES_SCOPE,
+    POSTS_SCOPE,
+    USERS_SCOPE,
+    bump_versions
+)
+from blog.search import rebuild_search_index
+from blog.streaming import iter_json_array
+
+OPENERS = {'.gz': gzip.open, '.bz2': bz2.open}
+
+
+def open_fixture(path):
+    for suffix, opener in OPENERS.items():
+        if path.endswith(suffix):
+            return opener(path, 'rt', encoding='utf-8')
+    return open(path, encoding='utf-8')
+
+
+def insert_rows(model, objs, using, batch_size):
+    """Вставляет строки как loaddata: в режиме raw, с заменой по pk.
+
+    bulk_create перезаписал бы значения полей auto_now и auto_now_add
+    из дампа и не умеет вставлять в режиме raw, поэтому строки пишутся
+    напрямую через QuerySet._insert.
+    """
+    opts = model._meta
+    fields = opts.local_concrete_fields
+    # Дампы, снятые до появления поля с auto_now, не содержат его
+    # значения: такие поля заполняются текущим временем.
+    auto_fields = [
+        field for field in fields
+        if getattr(field, 'auto_now', False)
+        or getattr(field, 'auto_now_add', False)
+    ]
+    for obj in objs:
+        for field in auto_fields:
+            if getattr(obj, field.attname) is None:
+                field.pre_save(obj, add=True)
+    update_fields = [field for field in fields if not field.primary_key]
+    size = max(1, min(
+        batch_size, connections[using].ops.bulk_batch_size(fields, objs)
+    ))
+    queryset = model._base_manager.using(using)
+    for start in range(0, len(objs), size):
+        # _insert — закрытый API Django, которым пользуются bulk_create
+        # и Model.save_base; при обновлении Django сверяйте сигнатуру.
+        queryset._insert(
+            objs[start:start + size], fields=fields, raw=True, using=using,
+            on_conflict=OnConflict.UPDATE, update_fields=update_fields,
+            unique_fields=[opts.pk]
+        )
+
+
+class Loader:
+    """Копит объекты по моделям и вставляет их пачками.
+
+    Объекты с pk вставляются через insert_rows, без pk — bulk_create.
+    """
+
+    def __init__(self, using, batch_size):
+        self.using = using
+        self.batch_size = batch_size
+        self.pending = defaultdict(list)
+        self.deferred = []
+        self.counts = Counter()
+
+    def add(self, deserialized):
+        model = type(deserialized.object)
+        if model._meta.parents:
+            # Пакетная вставка не поддерживает наследование с несколькими
+            # таблицами — такие объекты сохраняются по одному.
+            deserialized.save(using=self.using)
+            self.counts[model] += 1
+        else:
+            self.pending[model].append(deserialized)
+            if len(self.pending[model]) >= self.batch_size:
+                self.flush(model)
+        if deserialized.deferred_fields:
+            self.deferred.append(deserialized)
+
+    def flush(self, model):
+        batch, self.pending[model] = self.pending[model], []
+        if not batch:
+            return
+        objs = [deserialized.object for deserialized in batch]
+        with_pk = [obj for obj in objs if obj.pk is not None]
+        if with_pk:
+            insert_rows(model, with_pk, self.using, self.batch_size)
+        if len(with_pk) < len(objs):
+            model._base_manager.using(self.using).bulk_create(
+                [obj for obj in objs if obj.pk is None]
+            )
+        self.counts[model] += len(batch)
+        self.flush_m2m(model, batch)
+
+    def flush_m2m(self, model, batch):
+        for field in model._meta.many_to_many:
+            through = field.remote_field.through
+            if not through._meta.auto_created:
+                continue
+            source = field.m2m_field_name() + '_id'
+            target = field.m2m_reverse_field_name() + '_id'
+            through.objects.using(self.using).bulk_create(
+                [
+                    through(**{source: deserialized.object.pk,
+                               target: value})
+                    for deserialized in batch
+                    for value in deserialized.m2m_data.get(field.name, ())
+                ],
+                batch_size=self.batch_size, ignore_conflicts=True
+            )
+
+    def finish(self):
+        for model in list(self.pending):
+            self.flush(model)
+        for deserialized in self.deferred:
+            deserialized.save_deferred_fields(using=self.using)
+
+
+class Command(BaseCommand):
+    help = ('Потоково загружает JSON-фикстуру: объекты вставляются '
+            'пачками многострочных INSERT в одной транзакции.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixtures', nargs='+', metavar='fixture')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            '-i', '--ignorenonexistent', action='store_true',
+            help='Пропускать поля и модели, которых нет в проекте.'
+        )
+
+    def handle(self, *args, **options):
+        using = options['database']
+        connection = connections[using]
+        loader = Loader(using, options['batch_size'])
+        start = time.perf_counter()
+        with transaction.atomic(using=using):
+            with connection.constraint_checks_disabled():
+                for path in options['fixtures']:
+                    self.load(path, loader, options)
+                loader.finish()
+            # Внешние ключи проверяются один раз после вставки всех строк.
+            connection.check_constraints(table_names=[
+                model._meta.db_table for model in loader.counts
+            ])
+            self.reset_sequences(connection, loader.counts)
+            self.rebuild_blog_data(loader.counts, using)
+        # Сигналы не срабатывали: сбрасываем кеш блога после фиксации.
+        bump_versions(POSTS_SCOPE, PAGES_SCOPE, USERS_SCOPE, CATEGORIES_SCOPE)
+        self.report(loader.counts, time.perf_counter() - start)
+
+    def load(self, path, loader, options):
+        try:
+            with open_fixture(path) as file:
+                for deserialized in serializers.deserialize(
+                    'python', iter_json_array(file), using=loader.using,
+                    ignorenonexistent=options['ignorenonexistent'],
+                    handle_forward_references=True
+                ):
+                    loader.add(deserialized)
+        except (OSError, ValueError, serializers.base.DeserializationError
+                ) as error:
+            raise CommandError(f'Не удалось загрузить {path}: {error}')
+
+    def reset_sequences(self, connection, models):
+        sql = connection.ops.sequence_reset_sql(no_style(), list(models))
+        if sql:
+            with connection.cursor() as cursor:
+                for line in sql:
+                    cursor.execute(line)
+
+    def rebuild_blog_data(self, models, using):
+        # Пакетная вставка не вызывает сигналы, поэтому производные
+        # данные публикаций пересчитываются после загрузки.
+        Post = apps.get_model('blog', 'Post')
+        Comment = apps.get_model('blog', 'Comment')
+        if Post in models or Comment in models:
+            Post.objects.using(using).rebuild_comment_count()
+        if Post in models:
+            rebuild_search_index(using)
+
+    def report(self, counts, elapsed):
+        total = sum(counts.values())
+        for model, count in counts.items():
+            self.stdout.write(f'{model._meta.label}: {count}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено объектов: {total} за {elapsed:.2f} с '
+            f'({total / max(elapsed, 1e-9):.0f} в секунду)'
+        ))
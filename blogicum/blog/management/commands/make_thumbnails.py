@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from blog.images import make_thumbnails
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Создаёт уменьшенные копии изображений публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Пересоздать уже существующие уменьшенные копии.'
+        )
+
+    def handle(self, *args, **options):
+        created = 0
+        for post in Post.objects.exclude(image='').only('image').iterator():
+            try:
+                created += len(make_thumbnails(post.image, options['force']))
+            except OSError as error:
+                self.stderr.write(f'{post.image.name}: {error}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано уменьшенных копий: {created}'
+        ))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает поле comment_count у всех публикаций.'
+
+    def handle(self, *args, **options):
+        updated = Post.objects.rebuild_comment_count()
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитано публикаций: {updated}'
+        ))
@@ -0,0 +1,43 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from blog.jobs import work
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=2,
+            help='Число процессов-обработчиков.'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить задачи из очереди и завершиться.'
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=1.0,
+            help='Пауза в секундах, когда очередь пуста.'
+        )
+
+    def handle(self, *args, **options):
+        once, sleep = options['once'], options['sleep']
+        if options['processes'] <= 1:
+            processed = work(once, sleep)
+        else:
+            connections.close_all()
+            with ProcessPoolExecutor(
+                options['processes'], initializer=django.setup
+            ) as pool:
+                futures = [
+                    pool.submit(work, once, sleep)
+                    for _ in range(options['processes'])
+                ]
+                processed = sum(future.result() for future in futures)
+        self.stdout.write(self.style.SUCCESS(
+            f'Выполнено задач: {processed}'
+        ))
@@ -0,0 +1,145 @@
+import random
+import time
+from datetime import timedelta
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from blog.cache import (
+    CATEGORIES_SCOPE,
+    PAGES_SCOPE,
+    POSTS_SCOPE,
+    USERS_SCOPE,
+    bump_versions
+)
+from blog.models import Category, Comment, Location, Post, User
+from blog.search import rebuild_search_index
+
+WORDS = (
+    'город', 'река', 'горы', 'дорога', 'утро', 'вечер', 'поезд', 'море',
+    'лес', 'книга', 'кофе', 'музей', 'история', 'зима', 'лето', 'друзья',
+    'проект', 'код', 'фото', 'рецепт', 'прогулка', 'концерт', 'выставка',
+    'озеро', 'маршрут', 'погода', 'рассвет', 'закат', 'улица', 'парк',
+)
+USERNAME_PREFIX = 'bench_user_'
+SLUG_PREFIX = 'bench-category-'
+PASSWORD = 'benchmark'
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Command(BaseCommand):
+    help = ('Заполняет базу синтетическими пользователями, публикациями '
+            'и комментариями для нагрузочного тестирования.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--posts', type=int, default=10_000)
+        parser.add_argument('--comments', type=int, default=50_000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--locations', type=int, default=50)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Зерно генератора: одинаковое зерно даёт одинаковые данные.'
+        )
+
+    def handle(self, *args, **options):
+        if (
+            User.objects.filter(username__startswith=USERNAME_PREFIX).exists()
+            or Category.objects.filter(slug__startswith=SLUG_PREFIX).exists()
+        ):
+            raise CommandError(
+                'В базе уже есть данные seed_benchmark, '
+                'запустите команду на чистой базе.'
+            )
+        self.random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.password = make_password(PASSWORD)
+        users = self.create('пользователей', User, options['users'],
+                            self.make_user)
+        categories = self.create('категорий', Category,
+                                 options['categories'], self.make_category)
+        locations = self.create('местоположений', Location,
+                                options['locations'], self.make_location)
+        posts = self.create(
+            'публикаций', Post, options['posts'],
+            lambda i: self.make_post(i, users, categories, locations)
+        )
+        self.create(
+            'комментариев', Comment, options['comments'],
+            lambda i: self.make_comment(posts, users), keep_ids=False
+        )
+        Post.objects.rebuild_comment_count()
+        rebuild_search_index()
+        # bulk_create не шлёт сигналы, поэтому кеш сбрасываем сами.
+        bump_versions(POSTS_SCOPE, PAGES_SCOPE, USERS_SCOPE, CATEGORIES_SCOPE)
+
+    def create(self, label, model, total, make, keep_ids=True):
+        """Создаёт объекты пачками.
+
+        Возвращает id созданных объектов, если на них ссылаются
+        следующие модели; иначе список не копится и пачки не держатся
+        в памяти.
+        """
+        start = time.perf_counter()
+        ids = []
+        for batch in batched(map(make, range(total)), self.batch_size):
+            with transaction.atomic():
+                created = model.objects.bulk_create(batch)
+            if keep_ids:
+                ids += [obj.pk for obj in created]
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано {label}: {total} за {elapsed:.1f} с '
+            f'({total / max(elapsed, 1e-9):.0f} в секунду)'
+        ))
+        return ids
+
+    def sentence(self, words):
+        return ' '.join(self.random.choices(WORDS, k=words)).capitalize()
+
+    def make_user(self, i):
+        return User(
+            username=f'{USERNAME_PREFIX}{i}', password=self.password,
+            email=f'{USERNAME_PREFIX}{i}@example.com',
+        )
+
+    def make_category(self, i):
+        return Category(
+            title=self.sentence(2), description=self.sentence(12),
+            slug=f'{SLUG_PREFIX}{i}',
+            is_published=self.random.random() > 0.1,
+        )
+
+    def make_location(self, i):
+        return Location(name=self.sentence(2))
+
+    def make_post(self, i, users, categories, locations):
+        return Post(
+            title=self.sentence(5),
+            text='\n'.join(self.sentence(20) for _ in range(3)),
+            author_id=self.random.choice(users),
+            category_id=self.random.choice(categories),
+            location_id=self.random.choice(locations),
+            is_published=self.random.random() > 0.05,
+            # Небольшая доля публикаций получается отложенной.
+            pub_date=self.now + timedelta(
+                minutes=self.random.randint(-3 * 365 * 24 * 60, 7 * 24 * 60)
+            ),
+        )
+
+    def make_comment(self, posts, users):
+        return Comment(
+            text=self.sentence(10),
+            post_id=self.random.choice(posts),
+            author_id=self.random.choice(users),
+        )
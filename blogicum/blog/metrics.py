@@ -0,0 +1,197 @@
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (
+    10 * 1024, 100 * 1024, 1024 ** 2, 5 * 1024 ** 2, 10 * 1024 ** 2
+)
+
+METRICS = {
+    'blog_requests_total': (
+        'counter', 'Число HTTP-запросов.', None
+    ),
+    'blog_request_duration_seconds': (
+        'histogram', 'Время обработки запроса.', DURATION_BUCKETS
+    ),
+    'blog_request_queries': (
+        'histogram', 'Число SQL-запросов на HTTP-запрос.', QUERY_BUCKETS
+    ),
+    'blog_template_render_seconds': (
+        'histogram', 'Время отрисовки шаблона.', DURATION_BUCKETS
+    ),
+    'blog_cache_requests_total': (
+        'counter', 'Обращения к кешу по результату hit/miss.', None
+    ),
+    'blog_upload_size_bytes': (
+        'histogram', 'Размер загруженных файлов.', SIZE_BUCKETS
+    ),
+}
+
+
+class Registry:
+    """Счётчики и гистограммы одного процесса.
+
+    Если задана настройка BLOG_METRICS_DIR, значения периодически
+    сбрасываются в файл процесса в этом каталоге, а при выдаче метрик
+    суммируются по файлам всех процессов, например воркеров gunicorn.
+    Каталог нужно очищать перед запуском сервиса.
+    """
+
+    def __init__(self, name=None):
+        self.name = name
+        self.lock = threading.Lock()
+        self.values = defaultdict(float)
+        self.flushed_at = 0.0
+
+    @property
+    def path(self):
+        directory = getattr(settings, 'BLOG_METRICS_DIR', None)
+        if not directory:
+            return None
+        return Path(directory) / f'{self.name or os.getpid()}.json'
+
+    def inc(self, name, labels, amount=1):
+        with self.lock:
+            self.values[name, tuple(sorted(labels.items()))] += amount
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        with self.lock:
+            key = tuple(sorted(labels.items()))
+            for bound in (*buckets, math.inf):
+                if value <= bound:
+                    self.values[
+                        f'{name}_bucket', key + (('le', bound),)
+                    ] += 1
+            self.values[f'{name}_sum', key] += value
+            self.values[f'{name}_count', key] += 1
+
+    def flush(self, force=False):
+        path = self.path
+        interval = getattr(settings, 'BLOG_METRICS_FLUSH_INTERVAL', 1.0)
+        if path is None or (
+            not force and time.monotonic() - self.flushed_at < interval
+        ):
+            return
+        with self.lock:
+            data = [
+                [name, labels, value]
+                for (name, labels), value in self.values.items()
+            ]
+            self.flushed_at = time.monotonic()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle, temp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(handle, 'w') as file:
+            json.dump(data, file)
+        os.replace(temp, path)
+
+    def collect(self):
+        path = self.path
+        if path is None:
+            with self.lock:
+                return dict(self.values)
+        self.flush(force=True)
+        values = defaultdict(float)
+        for file in path.parent.glob('*.json'):
+            try:
+                data = json.loads(file.read_text())
+            except (OSError, ValueError):
+                continue
+            for name, labels, value in data:
+                values[name, tuple(tuple(label) for label in labels)] += value
+        return values
+
+
+registry = Registry()
+
+
+def format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(
+        '{}="{}"'.format(key, (
+            format_value(value) if key == 'le' else str(value)
+        ).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in labels
+    ) + '}'
+
+
+def sample_order(sample):
+    (name, labels), _ = sample
+    plain = tuple(label for label in labels if label[0] != 'le')
+    le = dict(labels).get('le', 0)
+    suffix = ('_bucket', '_sum', '_count').index(
+        name[name.rfind('_'):]
+    ) if name.endswith(('_bucket', '_sum', '_count')) else 0
+    return plain, suffix, le
+
+
+def render(values):
+    """Выводит метрики в текстовом формате Prometheus."""
+    lines = []
+    for family, (kind, help_text, buckets) in METRICS.items():
+        names = (
+            {f'{family}_bucket', f'{family}_sum', f'{family}_count'}
+            if buckets else {family}
+        )
+        lines += [f'# HELP {family} {help_text}', f'# TYPE {family} {kind}']
+        for (name, labels), value in sorted(
+            ((key, value) for key, value in values.items()
+             if key[0] in names),
+            key=sample_order
+        ):
+            lines.append(
+                f'{name}{format_labels(labels)} {format_value(value)}'
+            )
+    return '\n'.join(lines) + '\n'
+
+
+def get_cache_kind(key):
+    parts = str(key).split(':')
+    if parts[0] == 'blog' and len(parts) > 1:
+        return parts[1]
+    if str(key).startswith('template.cache.'):
+        return 'fragment'
+    return 'other'
+
+
+class MetricsCacheMixin:
+    """Считает попадания и промахи кеша по видам ключей."""
+
+    def get(self, key, default=None, version=None):
+        missing = object()
+        value = super().get(key, missing, version)
+        registry.inc('blog_cache_requests_total', {
+            'kind': get_cache_kind(key),
+            'result': 'miss' if value is missing else 'hit',
+        })
+        return default if value is missing else value
+
+
+class InstrumentedLocMemCache(MetricsCacheMixin, LocMemCache):
+    pass
+
+
+class InstrumentedFileBasedCache(MetricsCacheMixin, FileBasedCache):
+    pass
@@ -0,0 +1,201 @@
+import json
+import logging
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from blog.metrics import registry
+from blog.routers import get_replicas, primary_reason
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+logger = logging.getLogger('blog.sql')
+
+
+class ReplicaStickinessMiddleware:
+    """Направляет чтение в основную базу после записи клиента.
+
+    Небезопасные запросы читают только из основной базы, а после записи
+    клиент получает cookie, и его запросы следующие
+    BLOG_REPLICA_STICKY_SECONDS секунд тоже не уходят на реплики.
+    """
+
+    cookie_name = 'blog_primary'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not get_replicas():
+            return self.get_response(request)
+        sticky = (
+            request.method not in SAFE_METHODS
+            or self.cookie_name in request.COOKIES
+        )
+        token = primary_reason.set('sticky' if sticky else None)
+        try:
+            response = self.get_response(request)
+            wrote = primary_reason.get() == 'write'
+        finally:
+            primary_reason.reset(token)
+        if wrote:
+            response.set_cookie(
+                self.cookie_name, '1',
+                max_age=getattr(settings, 'BLOG_REPLICA_STICKY_SECONDS', 10),
+                httponly=True, samesite='Lax'
+            )
+        return response
+
+
+class QueryStats:
+    """Обёртка execute_wrapper: считает запросы и время в базе."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.statements[sql] += 1
+
+    def get_duplicates(self, threshold):
+        return [
+            {'sql': sql, 'count': count}
+            for sql, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+
+@contextmanager
+def track_queries(request):
+    """Подключает QueryStats ко всем соединениям на время запроса.
+
+    Статистика публикуется в request.query_stats; вложенная middleware
+    получает уже заведённую и не оборачивает запросы второй раз.
+    """
+    stats = getattr(request, 'query_stats', None)
+    if stats is not None:
+        yield stats
+        return
+    stats = request.query_stats = QueryStats()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(stats))
+        yield stats
+
+
+class QueryInstrumentationMiddleware:
+    """Считает SQL-запросы и время в базе для каждого запроса.
+
+    Итог уходит в заголовок Server-Timing и в лог blog.sql; одинаковые
+    запросы, повторённые BLOG_SQL_DUPLICATE_THRESHOLD раз и больше,
+    помечаются как вероятная проблема N+1. Включается настройкой
+    BLOG_SQL_INSTRUMENTATION.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'BLOG_SQL_INSTRUMENTATION', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.threshold = getattr(settings, 'BLOG_SQL_DUPLICATE_THRESHOLD', 3)
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        with track_queries(request) as stats:
+            response = self.get_response(request)
+        total = (time.perf_counter() - start) * 1000
+        db_time = stats.duration * 1000
+        timing = (
+            f'db;desc="{stats.count} queries";dur={db_time:.1f}, '
+            f'total;dur={total:.1f}'
+        )
+        if response.has_header('Server-Timing'):
+            timing = f"{response['Server-Timing']}, {timing}"
+        response['Server-Timing'] = timing
+        self.log(request, response, stats, db_time, total)
+        return response
+
+    def log(self, request, response, stats, db_time, total):
+        match = request.resolver_match
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view_name': match.view_name if match else None,
+            'status': response.status_code,
+            'queries': stats.count,
+            'db_time_ms': round(db_time, 2),
+            'total_time_ms': round(total, 2),
+            'duplicates': stats.get_duplicates(self.threshold),
+        }
+        logger.info(json.dumps(record, ensure_ascii=False), extra=record)
+        for duplicate in record['duplicates']:
+            logger.warning(
+                'Возможная проблема N+1 в %s: запрос выполнен %s раз: %s',
+                record['view_name'], duplicate['count'], duplicate['sql']
+            )
+
+
+class MetricsMiddleware:
+    """Собирает метрики запросов для эндпоинта /metrics/.
+
+    Время обработки и число SQL-запросов пишутся с меткой имени URL,
+    время отрисовки — с именем шаблона, размеры загруженных файлов — с
+    именем поля формы. Включается настройкой BLOG_METRICS.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'BLOG_METRICS', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        with track_queries(request) as stats:
+            response = self.get_response(request)
+        match = request.resolver_match
+        labels = {
+            'view': match.view_name if match else 'unresolved',
+            'method': request.method,
+        }
+        registry.inc('blog_requests_total',
+                     {**labels, 'status': response.status_code})
+        registry.observe('blog_request_duration_seconds', labels,
+                         time.perf_counter() - start)
+        registry.observe('blog_request_queries', labels, stats.count)
+        # Файлы разбираются только если их уже прочитало представление.
+        if hasattr(request, '_files'):
+            for field, files in request.FILES.lists():
+                for file in files:
+                    registry.observe('blog_upload_size_bytes',
+                                     {'field': field}, file.size)
+        registry.flush()
+        return response
+
+    def process_template_response(self, request, response):
+        # Ответы из кеша страниц уже отрисованы.
+        if response.is_rendered:
+            return response
+        start = time.perf_counter()
+        template_name = response.template_name
+        if isinstance(template_name, (list, tuple)):
+            template_name = template_name[0] if template_name else ''
+
+        def observe(response):
+            registry.observe(
+                'blog_template_render_seconds',
+                {'template': getattr(template_name, 'name', template_name)},
+                time.perf_counter() - start
+            )
+
+        response.add_post_render_callback(observe)
+        return response
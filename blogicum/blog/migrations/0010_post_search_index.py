@@ -0,0 +1,57 @@
+# Generated by Django 5.1.1 on 2026-10-17 09:10
+
+from django.db import migrations
+
+# Схема индекса зафиксирована здесь, а не импортируется из blog.search:
+# правки модуля не должны менять то, что делает старая миграция.
+FTS_TABLE = 'blog_post_fts'
+SEARCH_CONFIG = 'russian'
+SEARCH_INDEX = 'post_search_idx'
+
+
+def get_gin_index():
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    return GinIndex(
+        SearchVector('title', 'text', config=SEARCH_CONFIG),
+        name=SEARCH_INDEX
+    )
+
+
+def create_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5('
+            "title, text, tokenize='unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+            'SELECT id, title, text FROM blog_post'
+        )
+    elif vendor == 'postgresql':
+        schema_editor.add_index(
+            apps.get_model('blog', 'Post'), get_gin_index()
+        )
+
+
+def drop_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE {FTS_TABLE}')
+    elif vendor == 'postgresql':
+        schema_editor.remove_index(
+            apps.get_model('blog', 'Post'), get_gin_index()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_post_image_storage'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
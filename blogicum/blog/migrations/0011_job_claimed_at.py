@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-17 07:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_post_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Взята в работу'),
+        ),
+    ]
@@ -1,5 +1,11 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.functional import cached_property
+
+from blog.images import MIME_TYPES, get_image_sources
+from blog.storage import post_image_storage
 
 
 User = get_user_model()
@@ -49,6 +55,16 @@ class Location(PublishedModel):
         return self.name[:50]
 
 
+class PostQuerySet(models.QuerySet):
+    def change_comment_count(self, delta):
+        return self.update(comment_count=F('comment_count') + delta)
+
+    def rebuild_comment_count(self):
+        counts = Comment.objects.filter(post=OuterRef('pk')).order_by(
+        ).values('post').annotate(total=Count('pk')).values('total')
+        return self.update(comment_count=Coalesce(Subquery(counts), 0))
+
+
 class Post(PublishedModel):
     title = models.CharField(max_length=256, verbose_name='Заголовок')
     text = models.TextField(verbose_name='Текст')
@@ -60,7 +76,8 @@ class Post(PublishedModel):
     image = models.ImageField(
         verbose_name='Изображение',
         blank=True,
-        upload_to='post_images'
+        upload_to='post_images',
+        storage=post_image_storage
     )
     author = models.ForeignKey(
         User,
@@ -79,16 +96,67 @@ class Post(PublishedModel):
         on_delete=models.SET_NULL,
         verbose_name='Категория'
     )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True, verbose_name='Изменено'
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
         default_related_name = 'posts'
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                condition=models.Q(is_published=True),
+                name='post_published_feed_idx',
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_pub_date_idx',
+            ),
+            models.Index(
+                fields=('category', '-pub_date', '-id'),
+                name='post_category_pub_date_idx',
+            ),
+        )
 
     def __str__(self):
         return self.title[:50]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_image = instance.__dict__.get('image')
+        return instance
+
+    @property
+    def image_changed(self):
+        return self.image.name != getattr(self, '_loaded_image', None)
+
+    @cached_property
+    def image_variants(self):
+        return get_image_sources(self.image)
+
+    @property
+    def image_srcset(self):
+        return self.image_variants.get(None, '')
+
+    @property
+    def image_sources(self):
+        return [
+            {'type': MIME_TYPES[image_format], 'srcset': srcset}
+            for image_format, srcset in self.image_variants.items()
+            if image_format
+        ]
+
 
 class Comment(PublishedModel):
     text = models.TextField(verbose_name='Текст комментария')
@@ -108,6 +176,56 @@ class Comment(PublishedModel):
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at',)
         default_related_name = 'comments'
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_at_idx',
+            ),
+        )
 
     def __str__(self):
         return self.text[:50]
+
+
+class Job(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField(max_length=128, verbose_name='Задача')
+    kwargs = models.JSONField(default=dict, verbose_name='Аргументы')
+    status = models.CharField(
+        max_length=16, choices=STATUS_CHOICES, default=PENDING,
+        verbose_name='Статус'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name='Попыток'
+    )
+    claimed_at = models.DateTimeField(
+        null=True, blank=True, verbose_name='Взята в работу'
+    )
+    error = models.TextField(blank=True, verbose_name='Ошибка')
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name='Добавлено'
+    )
+    finished_at = models.DateTimeField(
+        null=True, blank=True, verbose_name='Завершено'
+    )
+
+    class Meta:
+        verbose_name = 'фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        ordering = ('pk',)
+        indexes = (
+            models.Index(fields=('status', 'id'), name='job_status_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.name} ({self.get_status_display()})'
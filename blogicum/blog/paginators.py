@@ -0,0 +1,189 @@
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Page, Paginator
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+from blog.cache import get_timeout
+
+
+class CursorPage:
+    is_cursor = True
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self.object_list)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not self._has_next:
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if not self._has_previous:
+            return None
+        return self.paginator.encode_cursor(
+            self.object_list[0], reverse=True
+        )
+
+
+class CursorPaginator:
+    """Keyset-пагинация по (field, id) без OFFSET.
+
+    Курсор кодирует ключ крайней записи страницы, поэтому стоимость
+    запроса не зависит от глубины листания.
+    """
+
+    field = 'pub_date'
+    descending = True
+
+    def __init__(self, object_list, per_page):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+
+    def encode_cursor(self, obj, reverse=False):
+        payload = [getattr(obj, self.field).isoformat(), obj.pk]
+        if reverse:
+            payload.append(1)
+        return base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(',', ':')).encode()
+        ).decode().rstrip('=')
+
+    @classmethod
+    def decode_cursor(cls, cursor):
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(
+                cursor + '=' * (-len(cursor) % 4)
+            ))
+            value, pk = parse_datetime(payload[0]), int(payload[1])
+            reverse = len(payload) > 2 and bool(payload[2])
+        except (binascii.Error, ValueError, TypeError, IndexError,
+                KeyError, AttributeError):
+            raise InvalidPage('Некорректный курсор страницы.')
+        if value is None or (settings.USE_TZ and timezone.is_naive(value)):
+            raise InvalidPage('Некорректный курсор страницы.')
+        return value, pk, reverse
+
+    @classmethod
+    def get_upper_bound(cls, cursor):
+        """Возвращает верхнюю границу поля для страницы после курсора.
+
+        Представление сводит её с остальными фильтрами в одно условие
+        `<=`, чтобы база начинала просмотр индекса прямо с курсора.
+        Для первой страницы, обратного и некорректного курсора — None.
+        """
+        if not cursor or not cls.descending:
+            return None
+        try:
+            value, pk, reverse = cls.decode_cursor(cursor)
+        except InvalidPage:
+            return None
+        return None if reverse else value
+
+    def get_ordering(self, reverse=False):
+        prefix = '-' if self.descending != reverse else ''
+        return f'{prefix}{self.field}', f'{prefix}pk'
+
+    def page(self, cursor=None):
+        if not cursor:
+            return self._build_page(
+                self.object_list.order_by(*self.get_ordering()),
+                reverse=False, from_cursor=False
+            )
+        value, pk, reverse = self.decode_cursor(cursor)
+        lookup = 'lt' if self.descending != reverse else 'gt'
+        queryset = self.object_list.filter(
+            Q(**{f'{self.field}__{lookup}': value})
+            | Q(**{self.field: value, f'pk__{lookup}': pk})
+        ).order_by(*self.get_ordering(reverse))
+        return self._build_page(queryset, reverse=reverse, from_cursor=True)
+
+    def _build_page(self, queryset, reverse, from_cursor):
+        objects = list(queryset[:self.per_page + 1])
+        has_more = len(objects) > self.per_page
+        objects = objects[:self.per_page]
+        if reverse:
+            objects.reverse()
+            return CursorPage(objects, self, has_next=True,
+                              has_previous=has_more)
+        return CursorPage(objects, self, has_next=has_more,
+                          has_previous=from_cursor)
+
+
+class CommentCursorPaginator(CursorPaginator):
+    field = 'created_at'
+    descending = False
+
+
+class ElidedPage(Page):
+    on_each_side = 2
+    on_ends = 1
+
+    @cached_property
+    def page_range(self):
+        return list(self.paginator.get_elided_page_range(
+            self.number, on_each_side=self.on_each_side, on_ends=self.on_ends
+        ))
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator, кеширующий число объектов.
+
+    Количество считается по облегчённому `count_queryset` без аннотаций
+    и select_related и хранится в кеше под версионированным ключом,
+    который сбрасывается при изменении публикаций и категорий.
+    """
+
+    def __init__(self, object_list, per_page, count_queryset=None,
+                 cache_key=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_queryset = count_queryset
+        self.cache_key = cache_key
+
+    def get_count(self):
+        if self.count_queryset is None:
+            return Paginator.count.func(self)
+        return self.count_queryset.count()
+
+    @cached_property
+    def count(self):
+        if self.cache_key is None:
+            return self.get_count()
+        return cache.get_or_set(
+            self.cache_key, self.get_count,
+            get_timeout('BLOG_COUNT_CACHE_TIMEOUT', 60)
+        )
+
+    def _get_page(self, *args, **kwargs):
+        return ElidedPage(*args, **kwargs)
@@ -0,0 +1,37 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+PRIMARY = 'default'
+
+# Причина, по которой чтение идёт в основную базу в текущем контексте:
+# None — можно читать с реплик, 'sticky' — недавняя запись клиента,
+# 'write' — запись в этом же запросе.
+primary_reason = ContextVar('blog_primary_reason', default=None)
+
+
+def get_replicas():
+    return getattr(settings, 'DATABASE_REPLICAS', ())
+
+
+def reads_from_replicas():
+    return bool(get_replicas()) and not primary_reason.get()
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not reads_from_replicas():
+            return PRIMARY
+        return random.choice(get_replicas())
+
+    def db_for_write(self, model, **hints):
+        primary_reason.set('write')
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY, *get_replicas()}
+        return {obj1._state.db, obj2._state.db} <= databases or None
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db == PRIMARY
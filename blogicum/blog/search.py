@@ -0,0 +1,92 @@
+import re
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'blog_post_fts'
+SEARCH_CONFIG = 'russian'
+
+
+def get_terms(query):
+    return re.findall(r'\w+', query or '')
+
+
+def get_search_vector():
+    # Совпадает с выражением GIN-индекса из миграции 0010, иначе
+    # PostgreSQL не сможет им воспользоваться.
+    from django.contrib.postgres.search import SearchVector
+
+    return SearchVector('title', 'text', config=SEARCH_CONFIG)
+
+
+def search_posts(posts, query):
+    """Оставляет в выборке публикации, содержащие все слова запроса.
+
+    Каждое слово ищется по префиксу: на SQLite через FTS5-таблицу
+    blog_post_fts, на PostgreSQL через GIN-индекс по tsvector.
+    """
+    terms = get_terms(query)
+    if not terms:
+        return posts.none()
+    vendor = connections[posts.db].vendor
+    if vendor == 'sqlite':
+        return posts.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            [' '.join(f'"{term}"*' for term in terms)]
+        ))
+    if vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery
+
+        return posts.annotate(search=get_search_vector()).filter(
+            search=SearchQuery(
+                ' & '.join(f'{term}:*' for term in terms),
+                config=SEARCH_CONFIG, search_type='raw'
+            )
+        )
+    for term in terms:
+        posts = posts.filter(Q(title__icontains=term)
+                             | Q(text__icontains=term))
+    return posts
+
+
+def index_post(post, using='default'):
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post.pk]
+        )
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+            'VALUES (%s, %s, %s)',
+            [post.pk, post.title, post.text]
+        )
+
+
+def unindex_post(post_id, using='default'):
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_id]
+        )
+
+
+def rebuild_search_index(using='default'):
+    """Заново заполняет FTS-таблицу, возвращает число публикаций.
+
+    Нужен после bulk_create и update, которые не вызывают сигналы.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+            'SELECT id, title, text FROM blog_post'
+        )
+        return cursor.rowcount
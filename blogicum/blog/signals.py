@@ -0,0 +1,110 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from blog.cache import (
+    CATEGORIES_SCOPE,
+    PAGES_SCOPE,
+    POSTS_SCOPE,
+    USERS_SCOPE,
+    bump_versions,
+    category_scope,
+    index_scope,
+    profile_scope
+)
+from blog.jobs import enqueue
+from blog.models import Category, Comment, Location, Post, User
+from blog.search import index_post, unindex_post
+
+
+def get_post_scopes(post_id):
+    post = Post.objects.filter(pk=post_id).values(
+        'author__username', 'category__slug'
+    ).first()
+    if post is None:
+        return []
+    scopes = [index_scope(), profile_scope(post['author__username'])]
+    if post['category__slug']:
+        scopes.append(category_scope(post['category__slug']))
+    return scopes
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_scopes(sender, instance, raw=False, **kwargs):
+    if not raw and instance.pk:
+        instance._previous_scopes = get_post_scopes(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def invalidate_saved_post(sender, instance, **kwargs):
+    bump_versions(
+        POSTS_SCOPE,
+        *getattr(instance, '_previous_scopes', []),
+        *get_post_scopes(instance.pk)
+    )
+
+
+@receiver(post_save, sender=Post)
+def create_thumbnails(sender, instance, raw=False, **kwargs):
+    if instance.image and instance.image_changed and not raw:
+        enqueue('blog.make_thumbnails', post_id=instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def update_search_index(sender, instance, using, **kwargs):
+    index_post(instance, using)
+
+
+@receiver(post_delete, sender=Post)
+def remove_from_search_index(sender, instance, using, **kwargs):
+    unindex_post(instance.pk, using)
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_deleted_post(sender, instance, **kwargs):
+    scopes = [index_scope()]
+    username = User.objects.filter(pk=instance.author_id).values_list(
+        'username', flat=True
+    ).first()
+    if username:
+        scopes.append(profile_scope(username))
+    slug = Category.objects.filter(pk=instance.category_id).values_list(
+        'slug', flat=True
+    ).first()
+    if slug:
+        scopes.append(category_scope(slug))
+    bump_versions(POSTS_SCOPE, *scopes)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category(sender, **kwargs):
+    bump_versions(POSTS_SCOPE, PAGES_SCOPE, CATEGORIES_SCOPE)
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_pages(sender, **kwargs):
+    bump_versions(PAGES_SCOPE)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_users(sender, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    bump_versions(PAGES_SCOPE, USERS_SCOPE)
+
+
+@receiver(post_save, sender=Comment)
+def increase_comment_count(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Post.objects.filter(pk=instance.post_id).change_comment_count(1)
+    bump_versions(*get_post_scopes(instance.post_id))
+
+
+@receiver(post_delete, sender=Comment)
+def decrease_comment_count(sender, instance, **kwargs):
+    Post.objects.filter(
+        pk=instance.post_id, comment_count__gt=0
+    ).change_comment_count(-1)
+    bump_versions(*get_post_scopes(instance.post_id))
@@ -0,0 +1,80 @@
+import hashlib
+import os
+import tempfile
+from pathlib import PurePosixPath
+
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Хранилище, именующее файлы по SHA-256 их содержимого.
+
+    Одинаковые загрузки сохраняются один раз, а URL файла не меняется,
+    пока не меняется содержимое. Производные файлы (например,
+    уменьшенные копии) сохраняются под своим именем через save_derived.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def save_derived(self, name, content):
+        # Копии пишутся во временный файл и атомарно заменяют прежние:
+        # обработчики параллельно пересоздают копии с одинаковыми именами.
+        temp_name = self._write_temp_file(name, content)
+        try:
+            os.replace(temp_name, self.path(name))
+        except BaseException:
+            os.remove(temp_name)
+            raise
+        self._set_permissions(name)
+        return name
+
+    def _write_temp_file(self, name, content, digest=None):
+        directory = os.path.dirname(self.path(name))
+        os.makedirs(directory, exist_ok=True)
+        temp_file = tempfile.NamedTemporaryFile(
+            dir=directory, prefix='.upload-', delete=False
+        )
+        try:
+            with temp_file:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    if digest is not None:
+                        digest.update(chunk)
+                    temp_file.write(chunk)
+        except BaseException:
+            os.remove(temp_file.name)
+            raise
+        return temp_file.name
+
+    def _set_permissions(self, name):
+        if self.file_permissions_mode is not None:
+            os.chmod(self.path(name), self.file_permissions_mode)
+
+    def _save(self, name, content):
+        path = PurePosixPath(name)
+        digest = hashlib.sha256()
+        temp_name = self._write_temp_file(name, content, digest)
+        try:
+            hexdigest = digest.hexdigest()
+            name = str(path.parent / hexdigest[:2]
+                       / f'{hexdigest}{path.suffix.lower()}')
+            if self.exists(name):
+                os.remove(temp_name)
+                return name
+            os.makedirs(os.path.dirname(self.path(name)), exist_ok=True)
+            # Одновременная загрузка того же файла могла успеть раньше;
+            # содержимое совпадает, поэтому файл можно перезаписать.
+            file_move_safe(temp_name, self.path(name), allow_overwrite=True)
+        except BaseException:
+            if os.path.exists(temp_name):
+                os.remove(temp_name)
+            raise
+        self._set_permissions(name)
+        return name
+
+
+def post_image_storage():
+    return ContentAddressedStorage()
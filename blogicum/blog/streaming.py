@@ -0,0 +1,51 @@
+import json
+
+WHITESPACE = ' \t\r\n'
+DELIMITERS = tuple(WHITESPACE + ',]')
+
+
+def decode_item(decoder, buffer, eof):
+    """Возвращает (элемент, конец) или None, если данных не хватает."""
+    if not buffer:
+        return None
+    try:
+        item, end = decoder.raw_decode(buffer)
+    except json.JSONDecodeError:
+        return None
+    # Элемент, за которым в буфере нет разделителя, мог быть обрезан
+    # (например, число 1.5 как 1), поэтому сначала дочитываем файл.
+    if eof or buffer[end:end + 1] in DELIMITERS:
+        return item, end
+    return None
+
+
+def iter_json_array(file, chunk_size=64 * 1024):
+    """Лениво разбирает JSON-массив из файла по одному элементу.
+
+    В памяти держится только текущий элемент и непрочитанный остаток
+    очередного блока, поэтому размер файла не ограничен памятью.
+    """
+    decoder = json.JSONDecoder()
+    buffer, started, eof = '', False, False
+    while True:
+        buffer = buffer.lstrip(WHITESPACE)
+        if buffer and not started:
+            if buffer[0] != '[':
+                raise ValueError('Ожидался JSON-массив.')
+            started, buffer = True, buffer[1:]
+            continue
+        if started and buffer[:1] == ']':
+            return
+        if started and buffer[:1] == ',':
+            buffer = buffer[1:]
+            continue
+        decoded = decode_item(decoder, buffer, eof)
+        if decoded:
+            yield decoded[0]
+            buffer = buffer[decoded[1]:]
+            continue
+        if eof:
+            raise ValueError('Некорректный или обрезанный JSON-массив.')
+        chunk = file.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
@@ -0,0 +1,32 @@
+from django.contrib.auth.forms import PasswordResetForm
+from django.contrib.auth.tokens import default_token_generator
+from django.utils import timezone
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from blog.cache import POSTS_SCOPE, bump_versions
+from blog.images import make_thumbnails
+from blog.jobs import task
+from blog.models import Post, User
+from blog.signals import get_post_scopes
+
+
+@task('blog.make_thumbnails')
+def make_post_thumbnails(post_id):
+    post = Post.objects.filter(pk=post_id).only('image').first()
+    if post is not None and post.image and make_thumbnails(post.image):
+        # Карточки и страницы, закешированные до появления копий,
+        # выводились без srcset — сбрасываем их.
+        Post.objects.filter(pk=post_id).update(updated_at=timezone.now())
+        bump_versions(POSTS_SCOPE, *get_post_scopes(post_id))
+
+
+@task('blog.send_password_reset')
+def send_password_reset(user_id, context, **kwargs):
+    user = User.objects.get(pk=user_id)
+    context.update(
+        user=user,
+        uid=urlsafe_base64_encode(force_bytes(user.pk)),
+        token=default_token_generator.make_token(user),
+    )
+    PasswordResetForm().send_mail(context=context, **kwargs)
@@ -11,6 +11,8 @@ urlpatterns = [
          name='post_detail'),
     path('posts/<int:post_id>/comment/', views.CommentCreateView.as_view(),
          name='add_comment'),
+    path('posts/<int:post_id>/comments/', views.CommentListView.as_view(),
+         name='comments'),
     path('posts/<int:post_id>/edit_comment/<int:comment_id>',
          views.CommentUpdateView.as_view(), name='edit_comment'),
     path('posts/<int:post_id>/delete_comment/<int:comment_id>',
@@ -25,5 +27,7 @@ urlpatterns = [
          name='edit_profile'),
     path('profile/<str:username>/', views.ProfileListView.as_view(),
          name='profile'),
+    path('metrics/', views.MetricsView.as_view(), name='metrics'),
+    path('search/', views.SearchListView.as_view(), name='search'),
     path('posts/create/', views.PostCreateView.as_view(), name='create_post'),
 ]
@@ -1,49 +1,224 @@
+from datetime import timedelta
+from hashlib import md5
+from urllib.parse import urlencode
+
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.core.paginator import InvalidPage
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import cached_property
 from django.views.generic import (
     CreateView,
     DeleteView,
     DetailView,
     ListView,
-    UpdateView
+    UpdateView,
+    View
 )
 
+from blog.cache import (
+    CATEGORIES_SCOPE,
+    PAGES_SCOPE,
+    USERS_SCOPE,
+    category_scope,
+    get_cached_object,
+    get_timeout,
+    index_scope,
+    make_key,
+    profile_scope
+)
 from blog.forms import CommentForm, PostForm, UserForm
+from blog.metrics import registry, render
 from blog.models import Category, Comment, Post, User
+from blog.paginators import (
+    CachedCountPaginator,
+    CommentCursorPaginator,
+    CursorPaginator
+)
+from blog.search import search_posts
 
 
 PAGINATE = 10
+COMMENTS_PAGINATE = 20
+PROFILE_FIELDS = (
+    'username', 'first_name', 'last_name', 'date_joined', 'is_staff'
+)
+
+
+def feed_now():
+    now = timezone.now()
+    bucket = getattr(settings, 'BLOG_FEED_NOW_BUCKET', 0)
+    if not bucket:
+        return now
+    return now - timedelta(seconds=now.timestamp() % bucket)
+
+
+def feed_cache_part():
+    # Без округления момент ленты меняется каждую микросекунду, и ключ
+    # с ним никогда бы не совпал. Тогда отложенные публикации появятся
+    # в кешированных страницах и счётчиках только по истечении кеша.
+    if not getattr(settings, 'BLOG_FEED_NOW_BUCKET', 0):
+        return None
+    return feed_now().timestamp()
 
 
-def posts_handler(posts=Post.objects.all(),
+def get_feed_until(cursor=None, paginator_class=CursorPaginator):
+    # Одна граница вместо двух: с `pub_date <= now` и условием курсора
+    # база просматривала бы индекс от текущего момента до курсора.
+    # Будущий курсор не должен открывать отложенные публикации.
+    now = feed_now()
+    bound = paginator_class.get_upper_bound(cursor)
+    return now if bound is None else min(bound, now)
+
+
+def posts_handler(posts=None,
                   filter_published=True,
                   select_related=True,
-                  annotate_comments=True):
+                  until=None):
+    if posts is None:
+        posts = Post.objects.all()
+
     if filter_published:
         posts = posts.filter(
             is_published=True,
             category__is_published=True,
-            pub_date__lte=timezone.now()
+            pub_date__lte=until or feed_now()
         )
 
     if select_related:
         posts = posts.select_related('author', 'category', 'location')
 
-    if annotate_comments:
-        posts = posts.annotate(comment_count=Count('comments')).order_by(
-            *Post._meta.ordering
+    return posts.order_by(*Post._meta.ordering)
+
+
+def get_post_or_404(user, post_id, select_related=True):
+    posts = posts_handler(select_related=select_related) | Post.objects.filter(
+        author_id=user.pk
+    )
+    return get_object_or_404(posts, pk=post_id)
+
+
+class CursorPaginationMixin:
+    cursor_pagination = None
+    cursor_paginator_class = CursorPaginator
+    cursor_kwarg = 'cursor'
+
+    def uses_cursor_pagination(self):
+        if self.cursor_pagination is not None:
+            return self.cursor_pagination
+        return getattr(settings, 'BLOG_CURSOR_PAGINATION', False)
+
+    def get_feed_until(self):
+        cursor = None
+        if self.uses_cursor_pagination():
+            cursor = self.request.GET.get(self.cursor_kwarg)
+        return get_feed_until(cursor, self.cursor_paginator_class)
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.uses_cursor_pagination():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = self.cursor_paginator_class(queryset, page_size)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidPage as error:
+            raise Http404(str(error))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class CachedCountMixin:
+    """Пагинация с кешированным числом объектов.
+
+    Представление должно определить `get_count_queryset()` — облегчённый
+    queryset для подсчёта — и `get_count_key()` — кортеж частей ключа
+    кеша, однозначно задающий этот подсчёт.
+    """
+
+    paginator_class = CachedCountPaginator
+
+    def get_paginator(self, queryset, per_page, orphans=0,
+                      allow_empty_first_page=True, **kwargs):
+        return self.paginator_class(
+            queryset, per_page, orphans=orphans,
+            allow_empty_first_page=allow_empty_first_page,
+            count_queryset=self.get_count_queryset(),
+            cache_key=make_key(
+                'count', feed_cache_part(), *self.get_count_key()
+            ),
+            **kwargs
         )
 
-    return posts
 
+class AnonymousPageCacheMixin:
+    """Кеширование страниц для анонимных посетителей.
+
+    Представление должно определить `get_page_cache_scope()` — область
+    кеша, версия которой сбрасывается при изменении данных страницы.
+    """
+
+    def get(self, request, *args, **kwargs):
+        timeout = get_timeout('BLOG_PAGE_CACHE_TIMEOUT')
+        if request.user.is_authenticated or not timeout:
+            return super().get(request, *args, **kwargs)
+        key = make_key(
+            'page', feed_cache_part(),
+            md5(request.get_full_path().encode()).hexdigest(),
+            scopes=(PAGES_SCOPE, self.get_page_cache_scope())
+        )
+        response = cache.get(key)
+        if response is not None:
+            return response
+        response = super().get(request, *args, **kwargs)
+
+        def store(response):
+            if response.status_code == 200 and not response.cookies:
+                cache.set(key, response, timeout)
 
-class IndexListView(ListView):
+        response.add_post_render_callback(store)
+        return response
+
+
+class IndexListView(AnonymousPageCacheMixin, CachedCountMixin,
+                    CursorPaginationMixin, ListView):
     paginate_by = PAGINATE
     template_name = 'blog/index.html'
-    queryset = posts_handler()
+
+    def get_page_cache_scope(self):
+        return index_scope()
+
+    def get_queryset(self):
+        return posts_handler(until=self.get_feed_until())
+
+    def get_count_queryset(self):
+        return posts_handler(select_related=False)
+
+    def get_count_key(self):
+        return 'index', None, None, True
+
+
+class SearchListView(ListView):
+    paginate_by = PAGINATE
+    paginator_class = CachedCountPaginator
+    template_name = 'blog/search.html'
+
+    @cached_property
+    def query(self):
+        return self.request.GET.get('q', '').strip()
+
+    def get_queryset(self):
+        return search_posts(posts_handler(), self.query)
+
+    def get_context_data(self, **kwargs):
+        return super().get_context_data(
+            **kwargs,
+            query=self.query,
+            page_query=urlencode({'q': self.query}) + '&'
+        )
 
 
 class PostDetailView(DetailView):
@@ -52,16 +227,36 @@ class PostDetailView(DetailView):
     pk_url_kwarg = 'post_id'
 
     def get_object(self):
-        post = super().get_object()
-        if post.author == self.request.user:
-            return post
-        return super().get_object(posts_handler(annotate_comments=False,
-                                                select_related=False))
+        return get_post_or_404(self.request.user,
+                               self.kwargs[self.pk_url_kwarg])
 
     def get_context_data(self, **kwargs):
-        return super().get_context_data(**kwargs,
-                                        form=CommentForm(),
-                                        comments=self.object.comments.all)
+        return super().get_context_data(
+            **kwargs,
+            form=CommentForm(),
+            comments=CommentCursorPaginator(
+                self.object.comments.select_related('author'),
+                COMMENTS_PAGINATE
+            ).page()
+        )
+
+
+class CommentListView(CursorPaginationMixin, ListView):
+    template_name = 'includes/comments.html'
+    paginate_by = COMMENTS_PAGINATE
+    cursor_pagination = True
+    cursor_paginator_class = CommentCursorPaginator
+
+    def get_queryset(self):
+        self.post = get_post_or_404(self.request.user,
+                                    self.kwargs['post_id'],
+                                    select_related=False)
+        return self.post.comments.select_related('author')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        return dict(context, post=self.post, comments=context['page_obj'],
+                    is_fragment=True)
 
 
 class PostCreateView(LoginRequiredMixin, CreateView):
@@ -76,13 +271,25 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         return reverse('blog:profile', args=[self.request.user.username])
 
 
-class PostMixin():
+class CachedObjectMixin:
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+        return self._object
+
+
+class PostMixin(CachedObjectMixin):
     template_name = 'blog/create.html'
     model = Post
     pk_url_kwarg = 'post_id'
 
+    def get_queryset(self):
+        return super().get_queryset().select_related('location')
+
     def dispatch(self, request, *args, **kwargs):
-        if self.get_object().author != request.user:
+        if self.get_object().author_id != request.user.pk:
             return redirect(
                 'blog:post_detail',
                 self.kwargs[self.pk_url_kwarg]
@@ -121,13 +328,13 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
                        args=[self.kwargs['post_id']])
 
 
-class CommentMixin():
+class CommentMixin(CachedObjectMixin):
     template_name = 'blog/comment.html'
     model = Comment
     pk_url_kwarg = 'comment_id'
 
     def dispatch(self, request, *args, **kwargs):
-        if self.get_object().author != request.user:
+        if self.get_object().author_id != request.user.pk:
             return redirect(
                 'blog:post_detail',
                 post_id=self.kwargs['post_id']
@@ -147,38 +354,77 @@ class CommentUpdateView(CommentMixin, LoginRequiredMixin, UpdateView):
     form_class = CommentForm
 
 
-class ProfileListView(ListView):
+class ProfileListView(AnonymousPageCacheMixin, CachedCountMixin,
+                      CursorPaginationMixin, ListView):
     template_name = 'blog/profile.html'
     paginate_by = PAGINATE
 
-    def get_author(self):
-        return get_object_or_404(User, username=self.kwargs['username'])
+    def get_page_cache_scope(self):
+        return profile_scope(self.kwargs['username'])
+
+    @cached_property
+    def author(self):
+        username = self.kwargs['username']
+        return get_cached_object(
+            User.objects.only(*PROFILE_FIELDS),
+            make_key('user', username, scopes=(USERS_SCOPE,)),
+            username=username
+        )
 
     def get_queryset(self):
-        author = self.get_author()
+        author = self.author
+        return posts_handler(
+            author.posts.all(),
+            filter_published=(self.request.user != author),
+            until=self.get_feed_until()
+        )
+
+    def get_count_queryset(self):
+        author = self.author
         return posts_handler(
             author.posts.all(),
-            filter_published=(self.request.user != author)
+            filter_published=(self.request.user != author),
+            select_related=False
         )
 
+    def get_count_key(self):
+        author = self.author
+        return 'profile', None, author.pk, self.request.user != author
+
     def get_context_data(self, **kwargs):
-        return super().get_context_data(**kwargs, profile=self.get_author())
+        return super().get_context_data(**kwargs, profile=self.author)
 
 
-class CategoryListView(ListView):
+class CategoryListView(AnonymousPageCacheMixin, CachedCountMixin,
+                       CursorPaginationMixin, ListView):
     paginate_by = PAGINATE
     template_name = 'blog/category.html'
 
-    def get_category(self):
-        return get_object_or_404(
-            Category, is_published=True, slug=self.kwargs['category_slug']
+    def get_page_cache_scope(self):
+        return category_scope(self.kwargs['category_slug'])
+
+    @cached_property
+    def category(self):
+        slug = self.kwargs['category_slug']
+        return get_cached_object(
+            Category.objects.filter(is_published=True),
+            make_key('category', slug, scopes=(CATEGORIES_SCOPE,)),
+            slug=slug
         )
 
     def get_queryset(self):
-        return posts_handler(self.get_category().posts.all())
+        return posts_handler(self.category.posts.all(),
+                             until=self.get_feed_until())
+
+    def get_count_queryset(self):
+        return posts_handler(self.category.posts.all(),
+                             select_related=False)
+
+    def get_count_key(self):
+        return 'category', self.category.pk, None, True
 
     def get_context_data(self, **kwargs):
-        return super().get_context_data(**kwargs, category=self.get_category())
+        return super().get_context_data(**kwargs, category=self.category)
 
 
 class UserUpdateView(LoginRequiredMixin, UpdateView):
@@ -192,3 +438,19 @@ class UserUpdateView(LoginRequiredMixin, UpdateView):
 
     def get_object(self):
         return self.request.user
+
+
+class MetricsView(View):
+    def get(self, request):
+        allowed = getattr(settings, 'BLOG_METRICS_ALLOWED_IPS', ())
+        if request.META.get('REMOTE_ADDR') not in allowed:
+            raise PermissionDenied
+        token = getattr(settings, 'BLOG_METRICS_TOKEN', None)
+        if token and not constant_time_compare(
+            request.headers.get('Authorization', ''), f'Bearer {token}'
+        ):
+            raise PermissionDenied
+        return HttpResponse(
+            render(registry.collect()),
+            content_type='text/plain; version=0.0.4; charset=utf-8'
+        )
@@ -47,6 +47,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'blog.middleware.MetricsMiddleware',
+    'blog.middleware.QueryInstrumentationMiddleware',
+    'blog.middleware.ReplicaStickinessMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -74,6 +77,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'blog.context_processors.post_card_cache',
             ],
         },
     },
@@ -85,10 +89,50 @@ WSGI_APPLICATION = 'blogicum.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# WAL lets readers work alongside a writer, busy_timeout makes writers
+# wait for the lock instead of failing, and IMMEDIATE transactions take
+# the write lock up front so they cannot deadlock on lock upgrade.
+SQLITE_OPTIONS = {
+    'init_command': (
+        'PRAGMA journal_mode=WAL;'
+        'PRAGMA synchronous=NORMAL;'
+        'PRAGMA mmap_size=134217728;'
+        'PRAGMA cache_size=-20000;'
+        'PRAGMA busy_timeout=5000;'
+    ),
+    'transaction_mode': 'IMMEDIATE',
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': SQLITE_OPTIONS,
+    }
+}
+
+# Read replicas are extra DATABASES aliases listed here; GET requests
+# read from them unless the client has written recently.
+# BLOG_REPLICA_STICKY_SECONDS is the replica lag the site tolerates: cache
+# entries built from replica reads live no longer than that.
+DATABASE_REPLICAS = []
+
+DATABASE_ROUTERS = ['blog.routers.ReplicaRouter']
+
+BLOG_REPLICA_STICKY_SECONDS = 10
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# For several worker processes use a shared backend, e.g.
+# blog.metrics.InstrumentedFileBasedCache or
+# django.core.cache.backends.db.DatabaseCache. The blog.metrics backends
+# count cache hits and misses for the /metrics/ endpoint.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'blog.metrics.InstrumentedLocMemCache',
+        'LOCATION': 'blogicum',
     }
 }
 
@@ -141,8 +185,66 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
 
 
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'blog': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
+}
+
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
 MEDIA_ROOT = BASE_DIR / 'media'
+
+BLOG_CURSOR_PAGINATION = False
+
+BLOG_FEED_NOW_BUCKET = 30
+
+BLOG_COUNT_CACHE_TIMEOUT = 60
+
+BLOG_PAGE_CACHE_TIMEOUT = 300
+
+BLOG_POST_CARD_CACHE_TIMEOUT = 600
+
+BLOG_LOOKUP_CACHE_TIMEOUT = 30
+
+BLOG_SQL_INSTRUMENTATION = DEBUG
+
+BLOG_SQL_DUPLICATE_THRESHOLD = 3
+
+BLOG_METRICS = True
+
+# With several worker processes point this at a directory shared by
+# them (and emptied on deploy) so /metrics/ sums all workers.
+BLOG_METRICS_DIR = None
+
+BLOG_METRICS_FLUSH_INTERVAL = 1.0
+
+BLOG_METRICS_ALLOWED_IPS = ['127.0.0.1']
+
+# When set, /metrics/ also requires "Authorization: Bearer <token>".
+BLOG_METRICS_TOKEN = None
+
+BLOG_THUMBNAIL_WIDTHS = (320, 640, 1280)
+
+BLOG_IMAGE_FORMATS = ('avif', 'webp')
+
+BLOG_IMAGE_QUALITY = {'jpeg': 85, 'webp': 80, 'avif': 60}
+
+BLOG_JOBS_EAGER = False
+
+BLOG_JOBS_MAX_ATTEMPTS = 3
+
+BLOG_JOBS_LEASE = 600
@@ -0,0 +1,91 @@
+"""
+Production settings for blogicum project.
+
+Select with DJANGO_SETTINGS_MODULE=blogicum.settings_production. Set
+POSTGRES_DB (and POSTGRES_USER, POSTGRES_PASSWORD, POSTGRES_HOST,
+POSTGRES_PORT) to use PostgreSQL; otherwise the SQLite database from
+settings.py is kept. The PostgreSQL connection pool needs
+psycopg[pool] from requirements.txt. DJANGO_SECRET_KEY is required.
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from blogicum.settings import *  # noqa: F401,F403
+from blogicum.settings import DATABASES
+
+
+def env_flag(name, default):
+    return os.environ.get(name, default).lower() in ('1', 'true', 'yes')
+
+
+DEBUG = env_flag('DJANGO_DEBUG', '0')
+
+BLOG_SQL_INSTRUMENTATION = env_flag('BLOG_SQL_INSTRUMENTATION', '0')
+
+BLOG_METRICS_DIR = os.environ.get('BLOG_METRICS_DIR')
+
+# The IP check trusts REMOTE_ADDR. Behind a reverse proxy on the same
+# host every request comes from 127.0.0.1, so the check alone leaves
+# /metrics/ public: set BLOG_METRICS_TOKEN or block /metrics/ at the proxy.
+BLOG_METRICS_ALLOWED_IPS = os.environ.get(
+    'BLOG_METRICS_ALLOWED_IPS', '127.0.0.1'
+).split(',')
+
+BLOG_METRICS_TOKEN = os.environ.get('BLOG_METRICS_TOKEN')
+
+# Never fall back to the development key from settings.py.
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY')
+if not SECRET_KEY:
+    raise ImproperlyConfigured('Set DJANGO_SECRET_KEY for production.')
+
+ALLOWED_HOSTS = os.environ.get(
+    'DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1'
+).split(',')
+
+
+# Database
+# https://docs.djangoproject.com/en/5.1/ref/databases/#persistent-connections
+
+# Keep connections open between requests and check them before reuse,
+# so a connection dropped by the server does not fail the next request.
+CONN_MAX_AGE = int(os.environ.get('DJANGO_CONN_MAX_AGE', 600))
+
+if os.environ.get('POSTGRES_DB'):
+    # The pool (psycopg[pool]) already reuses connections, and Django
+    # refuses to combine it with persistent connections.
+    POSTGRES_POOL = env_flag('POSTGRES_POOL', '1')
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ['POSTGRES_DB'],
+            'USER': os.environ.get('POSTGRES_USER', ''),
+            'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+            'HOST': os.environ.get('POSTGRES_HOST', ''),
+            'PORT': os.environ.get('POSTGRES_PORT', ''),
+            'CONN_MAX_AGE': 0 if POSTGRES_POOL else CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': not POSTGRES_POOL,
+            'OPTIONS': {
+                'pool': {
+                    'min_size': int(
+                        os.environ.get('POSTGRES_POOL_MIN_SIZE', 2)
+                    ),
+                    'max_size': int(
+                        os.environ.get('POSTGRES_POOL_MAX_SIZE', 10)
+                    ),
+                    'timeout': int(
+                        os.environ.get('POSTGRES_POOL_TIMEOUT', 10)
+                    ),
+                },
+            } if POSTGRES_POOL else {},
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            **DATABASES['default'],
+            'CONN_MAX_AGE': CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+        }
+    }
@@ -79,6 +79,28 @@ def post_of_another_author(
     )
 
 
+@pytest.fixture
+def blend_published_post(mixer: Mixer, user, published_category):
+    def blend(amount=None, **fields):
+        fields = {
+            "author": user,
+            "category": published_category,
+            "is_published": True,
+            "pub_date": timezone.now() - timedelta(days=1),
+            **fields,
+        }
+        if amount is None:
+            return mixer.blend("blog.Post", **fields)
+        return mixer.cycle(amount).blend("blog.Post", **fields)
+
+    return blend
+
+
+@pytest.fixture
+def published_post(blend_published_post):
+    return blend_published_post()
+
+
 @pytest.fixture
 def post_with_published_location(
         mixer: Mixer, user, published_location, published_category):
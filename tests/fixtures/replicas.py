@@ -0,0 +1,31 @@
+import pytest
+from django.db import connections
+
+
+@pytest.fixture
+def replica(settings, tmp_path):
+    """Подключает реплику — отдельный файл SQLite.
+
+    Фикстура возвращает функцию, копирующую основную базу в реплику;
+    до её вызова реплика отстаёт от основной базы.
+    """
+    alias = "replica"
+    connections.settings[alias] = {
+        **connections.settings["default"],
+        "NAME": str(tmp_path / "replica.sqlite3"),
+        "CONN_MAX_AGE": None,
+    }
+    settings.DATABASE_REPLICAS = [alias]
+
+    def sync():
+        primary, copy = connections["default"], connections[alias]
+        primary.ensure_connection()
+        if copy.connection is None:
+            copy.connect()
+        primary.connection.backup(copy.connection)
+
+    sync()
+    yield sync
+    connections[alias].close()
+    del connections[alias]
+    del connections.settings[alias]
@@ -0,0 +1,143 @@
+"""Бюджеты производительности страниц.
+
+Файл tests/performance_budgets.json сопоставляет имени URL максимальное
+число SQL-запросов (`max_queries`) и время ответа (`max_ms`) на наборе
+данных из команды seed_benchmark. Тесты, принимающие фикстуру
+`url_budget`, параметризуются всеми записями файла. При превышении
+бюджета по запросам тест падает с диффом относительно сохранённого
+в записи списка запросов (`queries`); обновить его можно, запустив
+pytest с флагом `--update-budgets`.
+"""
+import difflib
+import json
+import re
+import time
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+BUDGETS_FILE = Path(__file__).resolve().parent.parent / (
+    "performance_budgets.json"
+)
+LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def load_budgets():
+    with open(BUDGETS_FILE, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def normalize_sql(sql):
+    return LITERAL_RE.sub("?", sql)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--update-budgets", action="store_true",
+        help="Сохранить текущие SQL-запросы страниц в файл бюджетов."
+    )
+
+
+def pytest_configure(config):
+    config.budgets = load_budgets()
+
+
+def pytest_generate_tests(metafunc):
+    if "url_budget" in metafunc.fixturenames:
+        budgets = metafunc.config.budgets
+        metafunc.parametrize(
+            "url_budget",
+            [(name, budgets[name]) for name in budgets],
+            ids=list(budgets)
+        )
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if config.getoption("--update-budgets"):
+        with open(BUDGETS_FILE, "w", encoding="utf-8") as file:
+            json.dump(config.budgets, file, ensure_ascii=False, indent=2)
+            file.write("\n")
+
+
+@pytest.fixture
+def budget_dataset(settings, django_user_model):
+    from blog.models import Comment
+    from blog.views import posts_handler
+
+    settings.BLOG_PAGE_CACHE_TIMEOUT = 0
+    settings.BLOG_COUNT_CACHE_TIMEOUT = 0
+    settings.BLOG_POST_CARD_CACHE_TIMEOUT = 0
+    settings.BLOG_LOOKUP_CACHE_TIMEOUT = 0
+    settings.PASSWORD_HASHERS = [
+        "django.contrib.auth.hashers.MD5PasswordHasher"
+    ]
+    call_command(
+        "seed_benchmark", users=10, posts=150, comments=600,
+        categories=5, locations=5, seed=0, stdout=StringIO()
+    )
+    post = posts_handler().filter(comment_count__gt=1).first()
+    comment = Comment.objects.filter(post=post).first()
+    return {
+        "post_id": post.pk,
+        "comment_id": comment.pk,
+        "username": post.author.username,
+        "category_slug": post.category.slug,
+        "author": post.author,
+        "comment_author": comment.author,
+    }
+
+
+def measure(client, url, repeat):
+    """Возвращает SQL первого запроса и лучшее время из `repeat`."""
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    # Журнал запросов очищается в начале каждого следующего запроса.
+    queries = [query["sql"] for query in context.captured_queries]
+    assert response.status_code == 200, (
+        f"Страница `{url}` из бюджета вернула статус "
+        f"{response.status_code}."
+    )
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        client.get(url)
+        timings.append((time.perf_counter() - start) * 1000)
+    return queries, min(timings)
+
+
+@pytest.fixture
+def check_budget(request, client, budget_dataset):
+    def check(name, budget):
+        login = budget.get("login")
+        if login:
+            client.force_login(budget_dataset[login])
+        url = reverse(name, kwargs={
+            key: budget_dataset[key] for key in budget.get("kwargs", ())
+        }) + budget.get("query", "")
+        queries, elapsed = measure(client, url, budget.get("repeat", 3))
+        actual = [normalize_sql(sql) for sql in queries]
+        if request.config.getoption("--update-budgets"):
+            budget["queries"] = actual
+        diff = "\n".join(difflib.unified_diff(
+            budget.get("queries", []), actual,
+            "сохранённые запросы", "текущие запросы", lineterm=""
+        ))
+        if len(actual) > budget["max_queries"]:
+            pytest.fail(
+                f"Страница `{name}` выполняет {len(actual)} SQL-запросов при "
+                f"бюджете {budget['max_queries']}. Изменения запросов:\n"
+                f"{diff}", pytrace=False
+            )
+        if elapsed > budget["max_ms"]:
+            pytest.fail(
+                f"Страница `{name}` отвечает за {elapsed:.1f} мс при бюджете "
+                f"{budget['max_ms']} мс.", pytrace=False
+            )
+
+    return check
@@ -0,0 +1,7 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_url_budget(url_budget, check_budget):
+    check_budget(*url_budget)
@@ -0,0 +1,32 @@
+import pytest
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_comments(mixer, post_with_published_location):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend("blog.Comment", post=post)
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что поле `comment_count` публикации увеличивается "
+        "при создании комментария."
+    )
+    comments[0].delete()
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что поле `comment_count` публикации уменьшается "
+        "при удалении комментария."
+    )
+
+
+def test_rebuild_comment_counts(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend("blog.Comment", post=post)
+    type(post).objects.update(comment_count=0)
+    call_command("rebuild_comment_counts")
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что команда `rebuild_comment_counts` пересчитывает "
+        "количество комментариев."
+    )
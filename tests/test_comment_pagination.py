@@ -0,0 +1,56 @@
+from http import HTTPStatus
+
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+COMMENTS_PER_PAGE = 20
+
+
+@pytest.fixture
+def commented_post(mixer, blend_published_post):
+    post = blend_published_post()
+    mixer.cycle(COMMENTS_PER_PAGE + 5).blend("blog.Comment", post=post)
+    return post
+
+
+def test_comments_are_paginated(client, commented_post):
+    response = client.get(f"/posts/{commented_post.id}/")
+    comments = response.context["comments"]
+    assert len(comments) == COMMENTS_PER_PAGE, (
+        "Убедитесь, что на странице публикации выводятся только первые "
+        f"{COMMENTS_PER_PAGE} комментариев."
+    )
+    assert comments.has_next()
+
+    response = client.get(
+        f"/posts/{commented_post.id}/comments/",
+        {"cursor": comments.next_cursor},
+    )
+    assert response.status_code == HTTPStatus.OK
+    rest = response.context["comments"]
+    assert not rest.has_next()
+    shown = [comment.id for comment in comments] + [c.id for c in rest]
+    expected = list(
+        commented_post.comments.order_by("created_at", "id")
+        .values_list("id", flat=True)
+    )
+    assert shown == expected, (
+        "Убедитесь, что подгружаемые комментарии продолжают список "
+        "без пропусков и повторов."
+    )
+    assert "<form" not in response.content.decode("utf-8")
+
+
+def test_comments_fragment_of_hidden_post(
+        another_user_client, commented_post
+):
+    commented_post.is_published = False
+    commented_post.save()
+    response = another_user_client.get(
+        f"/posts/{commented_post.id}/comments/"
+    )
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что комментарии снятой с публикации записи недоступны "
+        "другим пользователям."
+    )
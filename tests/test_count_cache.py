@@ -0,0 +1,50 @@
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    page_obj = response.context["page_obj"]
+    return (
+        [q["sql"] for q in context.captured_queries if "COUNT(*)" in q["sql"]],
+        page_obj.paginator.count,
+    )
+
+
+@override_settings(BLOG_PAGE_CACHE_TIMEOUT=0)
+@pytest.mark.parametrize("bucket", [30, 0])
+def test_feed_count_is_cached_and_invalidated(
+        settings, client, blend_published_post, published_category, bucket
+):
+    settings.BLOG_FEED_NOW_BUCKET = bucket
+    blend_published_post(N_PER_PAGE + 1)
+    url = f"/category/{published_category.slug}/"
+
+    queries, count = count_queries(client, url)
+    assert count == N_PER_PAGE + 1
+    assert len(queries) == 1, (
+        "Убедитесь, что число публикаций считается одним запросом."
+    )
+    assert "blog_comment" not in queries[0], (
+        "Убедитесь, что запрос количества публикаций не соединяется "
+        "с таблицей комментариев."
+    )
+
+    queries, count = count_queries(client, url)
+    assert not queries, (
+        "Убедитесь, что количество публикаций берётся из кеша."
+    )
+
+    blend_published_post(1)
+    queries, count = count_queries(client, url)
+    assert count == N_PER_PAGE + 2, (
+        "Убедитесь, что кеш количества публикаций сбрасывается "
+        "при создании публикации."
+    )
@@ -0,0 +1,105 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.paginators import CursorPaginator
+from blog.views import get_feed_until
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def feed_posts(mixer, user, published_category):
+    now = timezone.now()
+    pub_dates = (
+        now - timedelta(hours=i // 3 + 1) for i in range(N_PER_PAGE * 2 + 5)
+    )
+    return mixer.cycle(N_PER_PAGE * 2 + 5).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=pub_dates,
+    )
+
+
+def collect_pages(client, url):
+    pages = []
+    response = client.get(url)
+    while True:
+        assert response.status_code == HTTPStatus.OK
+        page = response.context["page_obj"]
+        pages.append([post.id for post in page])
+        if not page.has_next():
+            return pages, page
+        response = client.get(url, {"cursor": page.next_cursor})
+
+
+@override_settings(BLOG_CURSOR_PAGINATION=True)
+def test_cursor_pagination_walks_whole_feed(client, feed_posts):
+    pages, last_page = collect_pages(client, "/")
+    assert [len(page) for page in pages] == [N_PER_PAGE, N_PER_PAGE, 5], (
+        "Убедитесь, что при cursor-пагинации страницы ленты содержат "
+        f"по {N_PER_PAGE} публикаций."
+    )
+    expected = sorted(
+        feed_posts, key=lambda post: (post.pub_date, post.id), reverse=True
+    )
+    assert sum(pages, []) == [post.id for post in expected], (
+        "Убедитесь, что cursor-пагинация не теряет и не повторяет "
+        "публикации с одинаковой датой."
+    )
+    response = client.get("/", {"cursor": last_page.previous_cursor})
+    assert [post.id for post in response.context["page_obj"]] == pages[-2]
+
+
+@override_settings(BLOG_CURSOR_PAGINATION=True)
+def test_cursor_pagination_rejects_broken_cursor(client, feed_posts):
+    response = client.get("/", {"cursor": "not-a-cursor"})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@override_settings(BLOG_CURSOR_PAGINATION=True)
+def test_future_cursor_hides_scheduled_posts(
+        client, mixer, user, published_category, feed_posts):
+    scheduled = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() + timedelta(days=1),
+    )
+    cursor = CursorPaginator(None, N_PER_PAGE).encode_cursor(
+        type(scheduled)(pub_date=timezone.now() + timedelta(days=2), pk=1)
+    )
+    response = client.get("/", {"cursor": cursor})
+    assert scheduled not in response.context["page_obj"], (
+        "Убедитесь, что курсор из будущего не открывает отложенные "
+        "публикации."
+    )
+
+
+@pytest.mark.skipif(
+    connection.vendor != "sqlite",
+    reason="План запроса проверяется только для SQLite.",
+)
+@override_settings(BLOG_CURSOR_PAGINATION=True)
+def test_cursor_page_starts_at_cursor(client, feed_posts):
+    cursor = client.get("/").context["page_obj"].next_cursor
+    with CaptureQueriesContext(connection) as context:
+        client.get("/", {"cursor": cursor})
+    sql = next(
+        query["sql"] for query in context.captured_queries
+        if 'FROM "blog_post"' in query["sql"] and "LIMIT" in query["sql"]
+    )
+    with connection.cursor() as db_cursor:
+        db_cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        plan = [row[-1] for row in db_cursor.fetchall()]
+    value, pk, reverse = CursorPaginator.decode_cursor(cursor)
+    assert get_feed_until(cursor) == value, (
+        "Убедитесь, что курсор и текущий момент сводятся к одной верхней "
+        "границе даты публикации."
+    )
+    assert not any("TEMP B-TREE" in detail for detail in plan), (
+        "Убедитесь, что индекс ленты покрывает сортировку по дате и id."
+    )
@@ -0,0 +1,129 @@
+import io
+import json
+import tracemalloc
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import IntegrityError
+from django.utils.dateparse import parse_datetime
+
+from blog.models import Comment, Post
+from blog.search import search_posts
+from blog.streaming import iter_json_array
+
+pytestmark = [pytest.mark.django_db]
+
+
+def fastload(*args):
+    call_command("fastload", *args, stdout=io.StringIO())
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_iter_json_array(chunk_size):
+    items = [{"text": "[],{}\"ю"}, 12345, 1.5e3, "строка", None, [1, [2]]]
+    stream = io.StringIO(json.dumps(items, ensure_ascii=False, indent=2))
+    assert list(iter_json_array(stream, chunk_size)) == items, (
+        "Убедитесь, что потоковый разбор JSON-массива не зависит от "
+        "размера читаемых блоков."
+    )
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO('[{"a": 1},'), chunk_size))
+
+
+def test_fastload_db_json():
+    fixture = settings.BASE_DIR / "db.json"
+    source = {
+        item["pk"]: item["fields"]
+        for item in json.loads(fixture.read_text(encoding="utf-8"))
+        if item["model"] == "blog.post"
+    }
+    fastload(str(fixture), "--batch-size", "5")
+    assert Post.objects.count() == len(source)
+    post = Post.objects.get(pk=next(iter(source)))
+    assert post.created_at == parse_datetime(
+        source[post.pk]["created_at"]
+    ), (
+        "Убедитесь, что fastload сохраняет значения полей с auto_now_add "
+        "из дампа."
+    )
+    assert post.updated_at is not None
+    assert post in search_posts(Post.objects.all(), post.title)
+
+
+def test_fastload_resets_cached_pages(client):
+    assert 'href="/posts/' not in client.get("/").content.decode()
+    fastload(str(settings.BASE_DIR / "db.json"))
+    assert 'href="/posts/' in client.get("/").content.decode(), (
+        "Убедитесь, что после загрузки закешированные страницы "
+        "сбрасываются."
+    )
+
+
+def test_fastload_round_trip(tmp_path, mixer, post_with_published_location):
+    mixer.cycle(3).blend(
+        "blog.Comment", post=post_with_published_location,
+        author=post_with_published_location.author
+    )
+    dump = tmp_path / "dump.json"
+    call_command("dumpdata", "auth.user", "blog", output=str(dump))
+    items = json.loads(dump.read_text(encoding="utf-8"))
+    # Дочерние объекты идут раньше родительских: внешние ключи
+    # проверяются только в конце загрузки.
+    dump.write_text(json.dumps(items[::-1]), encoding="utf-8")
+    Comment.objects.all().delete()
+    Post.objects.all().delete()
+    fastload(str(dump), "--batch-size", "2")
+    post = Post.objects.get(pk=post_with_published_location.pk)
+    assert post.comments.count() == 3
+    assert post.comment_count == 3, (
+        "Убедитесь, что после загрузки пересчитываются счётчики "
+        "комментариев."
+    )
+
+
+def test_fastload_rolls_back_on_missing_parent(tmp_path):
+    dump = tmp_path / "dump.json"
+    dump.write_text(json.dumps([{
+        "model": "blog.comment", "pk": 1,
+        "fields": {"text": "Текст", "post": 999, "author": 999,
+                   "created_at": "2024-01-01T00:00:00Z"},
+    }]), encoding="utf-8")
+    with pytest.raises(IntegrityError):
+        fastload(str(dump))
+    assert not Comment.objects.exists()
+
+
+def make_dump(path, total, post):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("[")
+        for i in range(total):
+            file.write(("," if i else "") + json.dumps({
+                "model": "blog.comment", "pk": i + 1,
+                "fields": {"text": "Комментарий " * 10, "post": post.pk,
+                           "author": post.author_id,
+                           "created_at": "2024-01-01T00:00:00Z"},
+            }, ensure_ascii=False))
+        file.write("]")
+
+
+def test_fastload_memory_is_flat(tmp_path, post_with_published_location):
+    peaks = []
+    for total in (1000, 4000):
+        path = tmp_path / f"{total}.json"
+        make_dump(path, total, post_with_published_location)
+        tracemalloc.start()
+        fastload(str(path), "--batch-size", "200")
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    assert Comment.objects.count() == 4000
+    assert peaks[1] < peaks[0] * 2, (
+        "Убедитесь, что потребление памяти fastload не растёт "
+        "с размером дампа."
+    )
+
+
+def test_fastload_missing_file():
+    with pytest.raises(CommandError):
+        fastload("missing.json")
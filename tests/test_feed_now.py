@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.views import feed_now
+
+pytestmark = [pytest.mark.django_db]
+
+
+@override_settings(BLOG_FEED_NOW_BUCKET=30)
+def test_feed_now_is_rounded_to_bucket():
+    now = feed_now()
+    assert now <= timezone.now()
+    assert now.timestamp() % 30 == 0, (
+        "Убедитесь, что момент фильтрации ленты округляется "
+        "до `BLOG_FEED_NOW_BUCKET` секунд."
+    )
+
+
+def test_scheduled_post_appears_without_restart(
+        client, monkeypatch, mixer, user, published_category
+):
+    real_now = timezone.now()
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=real_now + timedelta(hours=1),
+    )
+    response = client.get("/")
+    assert post not in response.context["page_obj"]
+
+    monkeypatch.setattr(
+        timezone, "now", lambda: real_now + timedelta(hours=2)
+    )
+    response = client.get("/")
+    assert post in response.context["page_obj"], (
+        "Убедитесь, что отложенная публикация появляется в ленте, когда "
+        "наступает время её публикации, без перезапуска сервера."
+    )
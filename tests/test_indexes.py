@@ -0,0 +1,52 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+INDEXED_TABLES = ("blog_post", "blog_comment")
+
+
+def get_full_scans(client, url):
+    with CaptureQueriesContext(connection) as context:
+        client.get(url)
+    full_scans = []
+    with connection.cursor() as cursor:
+        for query in context.captured_queries:
+            sql = query["sql"]
+            if not sql.startswith("SELECT"):
+                continue
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            for row in cursor.fetchall():
+                detail = row[-1]
+                for table in INDEXED_TABLES:
+                    if detail == f"SCAN {table}" or (
+                        f'FROM "{table}"' in sql
+                        and detail.startswith("USE TEMP B-TREE FOR ORDER BY")
+                    ):
+                        full_scans.append((sql, detail))
+    return full_scans
+
+
+@pytest.mark.skipif(
+    connection.vendor != "sqlite",
+    reason="План запроса проверяется только для SQLite.",
+)
+@pytest.mark.parametrize(
+    "get_url",
+    [
+        lambda post: "/",
+        lambda post: f"/category/{post.category.slug}/",
+        lambda post: f"/profile/{post.author.username}/",
+        lambda post: f"/posts/{post.id}/",
+    ],
+    ids=["index", "category", "profile", "post_detail"],
+)
+def test_views_use_indexes(client, mixer, post_with_published_location,
+                           get_url):
+    mixer.cycle(2).blend("blog.Comment", post=post_with_published_location)
+    full_scans = get_full_scans(client, get_url(post_with_published_location))
+    assert not full_scans, (
+        "Убедитесь, что запросы страницы используют индексы, а не полный "
+        f"просмотр или сортировку таблицы: {full_scans}"
+    )
@@ -0,0 +1,83 @@
+import re
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from blog.jobs import TASKS, enqueue, task
+from blog.models import Job
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def failing_task():
+    @task("tests.failing")
+    def failing():
+        raise RuntimeError("boom")
+
+    yield "tests.failing"
+    TASKS.pop("tests.failing")
+
+
+def test_password_reset_mail_is_queued(client, user, settings):
+    settings.EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+    user.email = "reader@example.com"
+    user.save()
+    client.post("/auth/password_reset/", {"email": user.email})
+    assert not mail.outbox, (
+        "Убедитесь, что письмо для сброса пароля не отправляется во время "
+        "запроса."
+    )
+    job = Job.objects.get(name="blog.send_password_reset")
+    assert not {"uid", "token"} & set(job.kwargs["context"]), (
+        "Убедитесь, что токен сброса пароля не сохраняется в очереди задач."
+    )
+
+    call_command("runworker", once=True, processes=1)
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == [user.email]
+    uid, token = re.search(
+        r"/auth/reset/([\w-]+)/([\w-]+)/", mail.outbox[0].body
+    ).groups()
+    assert uid == urlsafe_base64_encode(force_bytes(user.pk))
+    assert default_token_generator.check_token(user, token), (
+        "Убедитесь, что письмо содержит действующую ссылку сброса пароля."
+    )
+    assert Job.objects.get().status == Job.DONE
+
+
+def test_failing_job_is_retried(failing_task, settings):
+    settings.BLOG_JOBS_MAX_ATTEMPTS = 2
+    job = enqueue(failing_task)
+    call_command("runworker", once=True, processes=1)
+    job.refresh_from_db()
+    assert job.status == Job.FAILED
+    assert job.attempts == 2
+    assert "boom" in job.error
+
+
+def test_abandoned_job_is_claimed_again(settings):
+    settings.BLOG_JOBS_LEASE = 60
+    job = Job.objects.create(
+        name="blog.make_thumbnails", kwargs={"post_id": 0},
+        status=Job.RUNNING, attempts=1,
+        claimed_at=timezone.now() - timedelta(minutes=5),
+    )
+    fresh = Job.objects.create(
+        name="blog.make_thumbnails", kwargs={"post_id": 0},
+        status=Job.RUNNING, attempts=1, claimed_at=timezone.now(),
+    )
+    call_command("runworker", once=True, processes=1)
+    job.refresh_from_db()
+    fresh.refresh_from_db()
+    assert job.status == Job.DONE, (
+        "Убедитесь, что задача, зависшая в статусе «Выполняется» дольше "
+        "BLOG_JOBS_LEASE, снова выдаётся обработчику."
+    )
+    assert fresh.status == Job.RUNNING
@@ -0,0 +1,108 @@
+import re
+from io import BytesIO
+
+import pytest
+from PIL import Image
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from blog.metrics import Registry, registry
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def metrics_dir(settings, tmp_path):
+    settings.BLOG_METRICS = True
+    settings.BLOG_METRICS_DIR = tmp_path
+    settings.BLOG_METRICS_FLUSH_INTERVAL = 0
+    registry.values.clear()
+    yield tmp_path
+    registry.values.clear()
+
+
+def get_metrics(client):
+    response = client.get("/metrics/")
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    return response.content.decode()
+
+
+def get_sample(content, name, **labels):
+    pattern = re.escape(name) + r"\{([^}]*)\} (\S+)"
+    for found_labels, value in re.findall(pattern, content):
+        if all(f'{key}="{val}"' in found_labels
+               for key, val in labels.items()):
+            return float(value)
+    return None
+
+
+def test_request_metrics(client, post_with_published_location):
+    client.get("/")
+    client.get("/pages/about/")
+    content = get_metrics(client)
+    assert "# TYPE blog_request_duration_seconds histogram" in content
+    assert get_sample(
+        content, "blog_request_duration_seconds_count",
+        view="blog:index", method="GET"
+    ) == 1, (
+        "Убедитесь, что время обработки запросов собирается в гистограмму "
+        "с меткой имени URL."
+    )
+    assert get_sample(
+        content, "blog_request_duration_seconds_bucket",
+        view="pages:about", le="+Inf"
+    ) == 1
+    assert get_sample(
+        content, "blog_request_queries_sum", view="blog:index"
+    ) > 0
+    assert get_sample(
+        content, "blog_template_render_seconds_count",
+        template="blog/index.html"
+    ) == 1
+    assert get_sample(
+        content, "blog_cache_requests_total", kind="page", result="miss"
+    ) >= 1
+
+
+def test_upload_size(user_client, published_category):
+    image = BytesIO()
+    Image.new("RGB", (10, 10)).save(image, format="PNG")
+    user_client.post("/posts/create/", data={
+        "title": "Пост", "text": "Текст", "category": published_category.pk,
+        "pub_date": "2020-01-01 00:00",
+        "image": SimpleUploadedFile("img.png", image.getvalue()),
+    })
+    content = get_metrics(user_client)
+    assert get_sample(
+        content, "blog_upload_size_bytes_sum", field="image"
+    ) == len(image.getvalue())
+
+
+def test_metrics_aggregate_across_processes(client):
+    client.get("/pages/rules/")
+    worker = Registry(name="other-worker")
+    worker.inc("blog_requests_total",
+               {"view": "pages:rules", "method": "GET", "status": 200}, 2)
+    worker.flush(force=True)
+    assert get_sample(
+        get_metrics(client), "blog_requests_total", view="pages:rules"
+    ) == 3, (
+        "Убедитесь, что счётчики суммируются по файлам всех процессов."
+    )
+
+
+def test_metrics_are_internal(settings, client):
+    settings.BLOG_METRICS_ALLOWED_IPS = []
+    assert client.get("/metrics/").status_code == 403
+
+
+def test_metrics_token(settings, client):
+    settings.BLOG_METRICS_TOKEN = "secret"
+    assert client.get("/metrics/").status_code == 403, (
+        "Убедитесь, что при заданном BLOG_METRICS_TOKEN эндпоинт /metrics/ "
+        "недоступен без токена, даже с разрешённого адреса."
+    )
+    response = client.get(
+        "/metrics/", headers={"Authorization": "Bearer secret"}
+    )
+    assert response.status_code == 200
@@ -0,0 +1,63 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_page_urls(post):
+    return [
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    ]
+
+
+@pytest.mark.parametrize("bucket", [30, 0])
+def test_anonymous_pages_are_cached(settings, client, published_post, bucket):
+    settings.BLOG_FEED_NOW_BUCKET = bucket
+    for url in get_page_urls(published_post):
+        first = client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            second = client.get(url)
+        assert second.content == first.content
+        assert not context.captured_queries, (
+            f"Убедитесь, что страница `{url}` для анонимного пользователя "
+            "отдаётся из кеша без запросов к базе данных."
+        )
+
+
+def test_authorized_pages_are_not_cached(user_client, published_post):
+    for url in get_page_urls(published_post):
+        user_client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            user_client.get(url)
+        assert context.captured_queries, (
+            f"Убедитесь, что страница `{url}` не кешируется для "
+            "авторизованного пользователя."
+        )
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda post, mixer: setattr(post, "title", "Новый заголовок")
+        or post.save(),
+        lambda post, mixer: mixer.blend("blog.Comment", post=post),
+        lambda post, mixer: post.category.save(),
+        lambda post, mixer: mixer.blend("blog.Location"),
+    ],
+    ids=["post", "comment", "category", "location"],
+)
+def test_page_cache_invalidation(client, mixer, published_post, change):
+    urls = get_page_urls(published_post)
+    for url in urls:
+        client.get(url)
+    change(published_post, mixer)
+    for url in urls:
+        with CaptureQueriesContext(connection) as context:
+            client.get(url)
+        assert context.captured_queries, (
+            f"Убедитесь, что кеш страницы `{url}` сбрасывается при "
+            "изменении публикаций, комментариев, категорий и локаций."
+        )
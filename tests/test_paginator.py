@@ -0,0 +1,18 @@
+from django.template.loader import render_to_string
+
+from blog.paginators import CachedCountPaginator
+from conftest import N_PER_PAGE
+
+
+def test_paginator_renders_page_window():
+    paginator = CachedCountPaginator(range(N_PER_PAGE * 1000), N_PER_PAGE)
+    page = paginator.page(500)
+    html = render_to_string(
+        "includes/paginator.html", {"page_obj": page}
+    )
+    assert html.count('<li class="page-item') < 20, (
+        "Убедитесь, что пагинатор выводит окно страниц вокруг текущей, "
+        "а не ссылки на все страницы."
+    )
+    for number in (1, 498, 500, 502, 1000):
+        assert f">{number}<" in html
@@ -0,0 +1,46 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def card_post(blend_published_post):
+    return blend_published_post(title="Старый заголовок")
+
+
+def test_post_card_is_cached(user_client, card_post):
+    user_client.get("/")
+    type(card_post).objects.filter(pk=card_post.pk).update(
+        title="Заголовок без сигналов"
+    )
+    content = user_client.get("/").content.decode("utf-8")
+    assert "Старый заголовок" in content, (
+        "Убедитесь, что карточка публикации в ленте берётся из кеша, "
+        "пока публикация не изменилась."
+    )
+
+
+@pytest.mark.parametrize(
+    "change, expected",
+    [
+        (lambda post, mixer: setattr(post, "title", "Новый заголовок")
+         or post.save(), "Новый заголовок"),
+        (lambda post, mixer: mixer.blend("blog.Comment", post=post),
+         "Комментарии (1)"),
+        (lambda post, mixer: setattr(post.category, "title", "Новая")
+         or post.category.save(), "Новая"),
+        (lambda post, mixer: setattr(post.author, "username", "renamed")
+         or post.author.save(), "@renamed"),
+    ],
+    ids=["post", "comment", "category", "author"],
+)
+def test_post_card_cache_invalidation(
+        user_client, mixer, card_post, change, expected
+):
+    user_client.get("/")
+    change(card_post, mixer)
+    content = user_client.get("/").content.decode("utf-8")
+    assert expected in content, (
+        "Убедитесь, что кеш карточки публикации сбрасывается при изменении "
+        "публикации, комментариев, категории и автора."
+    )
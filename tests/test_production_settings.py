@@ -0,0 +1,52 @@
+import importlib
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+
+def load_production_settings(monkeypatch, **environ):
+    for name in ("POSTGRES_DB", "POSTGRES_POOL", "DJANGO_CONN_MAX_AGE"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("DJANGO_SECRET_KEY", "production-secret")
+    for name, value in environ.items():
+        monkeypatch.setenv(name, value)
+    module = importlib.import_module("blogicum.settings_production")
+    return importlib.reload(module)
+
+
+def test_sqlite_keeps_persistent_connections(monkeypatch):
+    production = load_production_settings(monkeypatch)
+    database = production.DATABASES["default"]
+    assert database["ENGINE"] == "django.db.backends.sqlite3"
+    assert database["CONN_MAX_AGE"] == 600, (
+        "Убедитесь, что в боевых настройках соединения с базой "
+        "переиспользуются и проверяются перед использованием."
+    )
+    assert database["CONN_HEALTH_CHECKS"]
+    assert not production.DEBUG
+
+
+@pytest.mark.parametrize("pool", ["1", "0"])
+def test_postgres_pool_excludes_persistent_connections(monkeypatch, pool):
+    production = load_production_settings(
+        monkeypatch, POSTGRES_DB="blogicum", POSTGRES_POOL=pool
+    )
+    database = production.DATABASES["default"]
+    assert database["ENGINE"] == "django.db.backends.postgresql"
+    if pool == "1":
+        assert "pool" in database["OPTIONS"]
+        assert database["CONN_MAX_AGE"] == 0, (
+            "Убедитесь, что при пуле соединений PostgreSQL постоянные "
+            "соединения отключены: Django не допускает их совместно."
+        )
+    else:
+        assert "pool" not in database["OPTIONS"]
+        assert database["CONN_MAX_AGE"] == 600
+
+
+def test_secret_key_is_required(monkeypatch):
+    production = load_production_settings(monkeypatch)
+    assert production.SECRET_KEY == "production-secret"
+    monkeypatch.delenv("DJANGO_SECRET_KEY")
+    with pytest.raises(ImproperlyConfigured):
+        importlib.reload(production)
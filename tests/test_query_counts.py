@@ -0,0 +1,86 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        client.get(url)
+    return len(context.captured_queries)
+
+
+def test_post_detail_query_count_is_constant(
+        user_client, mixer, published_post
+):
+    url = f"/posts/{published_post.id}/"
+    mixer.blend("blog.Comment", post=published_post)
+    few_comments = count_queries(user_client, url)
+    mixer.cycle(20).blend("blog.Comment", post=published_post)
+    many_comments = count_queries(user_client, url)
+    assert few_comments == many_comments, (
+        "Убедитесь, что число запросов к базе данных на странице публикации "
+        "не зависит от количества комментариев."
+    )
+
+
+@pytest.mark.parametrize(
+    "get_url, expected",
+    [
+        (lambda post, comment: f"/posts/{post.id}/", 4),
+        (lambda post, comment: f"/posts/{post.id}/edit/", 5),
+        (lambda post, comment: f"/posts/{post.id}/delete/", 3),
+        (lambda post, comment:
+         f"/posts/{post.id}/edit_comment/{comment.id}", 3),
+        (lambda post, comment:
+         f"/posts/{post.id}/delete_comment/{comment.id}", 3),
+    ],
+    ids=["post_detail", "edit_post", "delete_post", "edit_comment",
+         "delete_comment"],
+)
+def test_author_pages_query_count(
+        user_client, mixer, user, published_post, get_url, expected
+):
+    comment = mixer.blend("blog.Comment", post=published_post, author=user)
+    url = get_url(published_post, comment)
+    assert count_queries(user_client, url) == expected, (
+        f"Убедитесь, что страница `{url}` получает объект из базы данных "
+        "один раз за запрос."
+    )
+
+
+def lookup_queries(client, url, column):
+    with CaptureQueriesContext(connection) as context:
+        client.get(url)
+    return [
+        query["sql"] for query in context.captured_queries
+        if f'{column} = ' in query["sql"].split(" WHERE ")[-1]
+    ]
+
+
+@pytest.mark.parametrize(
+    "get_url, column, cache_timeout, expected",
+    [
+        (lambda post: f"/profile/{post.author.username}/",
+         '"auth_user"."username"', 0, 1),
+        (lambda post: f"/category/{post.category.slug}/",
+         '"blog_category"."slug"', 0, 1),
+        (lambda post: f"/profile/{post.author.username}/",
+         '"auth_user"."username"', 30, 0),
+        (lambda post: f"/category/{post.category.slug}/",
+         '"blog_category"."slug"', 30, 0),
+    ],
+    ids=["profile", "category", "profile_cached", "category_cached"],
+)
+def test_list_page_lookups(
+        another_user_client, settings, published_post, get_url, column,
+        cache_timeout, expected
+):
+    settings.BLOG_LOOKUP_CACHE_TIMEOUT = cache_timeout
+    url = get_url(published_post)
+    another_user_client.get(url)
+    assert len(lookup_queries(another_user_client, url, column)) == expected, (
+        f"Убедитесь, что страница `{url}` получает автора или категорию "
+        "не более одного раза за запрос, а при включённом кеше — из кеша."
+    )
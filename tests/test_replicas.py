@@ -0,0 +1,62 @@
+import time
+
+import pytest
+
+from blog.middleware import ReplicaStickinessMiddleware
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+@pytest.fixture(autouse=True)
+def no_page_cache(settings):
+    settings.BLOG_PAGE_CACHE_TIMEOUT = 0
+    settings.BLOG_COUNT_CACHE_TIMEOUT = 0
+    settings.BLOG_LOOKUP_CACHE_TIMEOUT = 0
+
+
+def test_reads_go_to_replica(
+        client, blend_published_post, replica):
+    blend_published_post(title="Пост с основной базы")
+    assert "Пост с основной базы" not in client.get("/").content.decode(), (
+        "Убедитесь, что при подключённых репликах чтение на GET-запросах "
+        "выполняется с реплики."
+    )
+    replica()
+    assert "Пост с основной базы" in client.get("/").content.decode()
+
+
+def test_reads_stick_to_primary_after_write(
+        user_client, blend_published_post, replica):
+    post = blend_published_post(title="Пост")
+    replica()
+    response = user_client.post(
+        f"/posts/{post.id}/comment/", data={"text": "Свежий комментарий"}
+    )
+    assert ReplicaStickinessMiddleware.cookie_name in response.cookies, (
+        "Убедитесь, что после записи клиент получает cookie, закрепляющую "
+        "его запросы за основной базой."
+    )
+    content = user_client.get(f"/posts/{post.id}/").content.decode()
+    assert "Свежий комментарий" in content, (
+        "Убедитесь, что после записи пользователь видит свои изменения, "
+        "даже если реплика ещё не синхронизирована."
+    )
+
+
+def test_caches_from_replica_expire_with_lag(
+        client, settings, blend_published_post, replica):
+    settings.BLOG_PAGE_CACHE_TIMEOUT = 300
+    settings.BLOG_REPLICA_STICKY_SECONDS = 1
+    post = blend_published_post(title="Старый заголовок")
+    replica()
+    client.get("/")
+    post.title = "Новый заголовок"
+    post.save()
+    # Версии кеша уже сброшены, а реплика ещё отдаёт старый пост.
+    assert "Старый заголовок" in client.get("/").content.decode()
+    replica()
+    time.sleep(1.1)
+    assert "Новый заголовок" in client.get("/").content.decode(), (
+        "Убедитесь, что страницы, закешированные по данным с реплики, "
+        "живут не дольше допустимого отставания реплик."
+    )
@@ -0,0 +1,89 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.search import rebuild_search_index
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def blend_post(blend_published_post):
+    def blend(title, text="Текст", **fields):
+        return blend_published_post(title=title, text=text, **fields)
+
+    return blend
+
+
+def search(client, query):
+    response = client.get("/search/", {"q": query})
+    assert response.status_code == 200
+    return list(response.context["page_obj"])
+
+
+def test_search_by_title_and_text(client, blend_post):
+    in_title = blend_post("Путешествие по Алтаю")
+    in_text = blend_post("Заметки", text="Неделя на алтайских озёрах")
+    blend_post("Рецепт борща")
+    assert set(search(client, "алта")) == {in_title, in_text}, (
+        "Убедитесь, что поиск находит публикации по началу слова "
+        "в заголовке и тексте без учёта регистра."
+    )
+    assert search(client, "алтаю путешествие") == [in_title]
+    assert search(client, '"') == []
+
+
+def test_search_applies_published_filters(
+        client, blend_post, mixer, user):
+    blend_post("Алтай опубликован")
+    blend_post("Алтай скрыт", is_published=False)
+    blend_post(
+        "Алтай в скрытой категории",
+        category=mixer.blend("blog.Category", is_published=False)
+    )
+    mixer.blend(
+        "blog.Post", author=user, title="Алтай отложен",
+        pub_date=timezone.now() + timedelta(days=1)
+    )
+    assert [post.title for post in search(client, "алтай")] == [
+        "Алтай опубликован"
+    ], (
+        "Убедитесь, что поиск показывает только опубликованные посты "
+        "из опубликованных категорий с наступившей датой публикации."
+    )
+
+
+def test_search_index_follows_changes(client, blend_post):
+    post = blend_post("Алтай")
+    post.title = "Байкал"
+    post.save()
+    assert search(client, "алтай") == []
+    assert search(client, "байкал") == [post], (
+        "Убедитесь, что поисковый индекс обновляется при изменении поста."
+    )
+    post.delete()
+    assert search(client, "байкал") == []
+
+
+def test_rebuild_search_index(client, blend_post, user, published_category):
+    from blog.models import Post
+
+    Post.objects.bulk_create([Post(
+        title="Эльбрус", text="Текст", author=user,
+        category=published_category,
+        pub_date=timezone.now() - timedelta(days=1),
+    )])
+    assert search(client, "эльбрус") == []
+    rebuild_search_index()
+    assert len(search(client, "эльбрус")) == 1
+
+
+def test_search_pagination_keeps_query(client, blend_post):
+    for i in range(12):
+        blend_post(f"Алтай {i}")
+    content = client.get("/search/", {"q": "алтай"}).content.decode()
+    assert "?q=%D0%B0%D0%BB%D1%82%D0%B0%D0%B9&amp;page=2" in content, (
+        "Убедитесь, что ссылки пагинации на странице поиска сохраняют "
+        "поисковый запрос."
+    )
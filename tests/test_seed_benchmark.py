@@ -0,0 +1,53 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count, F
+
+from blog.models import Category, Comment, Post, User
+
+pytestmark = [pytest.mark.django_db]
+
+
+def seed(**options):
+    call_command(
+        "seed_benchmark", users=5, posts=30, comments=60, categories=3,
+        locations=2, batch_size=7, stdout=StringIO(),
+        **options
+    )
+
+
+def test_seed_benchmark_creates_data():
+    seed()
+    assert User.objects.count() == 5
+    assert Post.objects.count() == 30
+    assert Comment.objects.count() == 60
+    assert not Post.objects.annotate(
+        total=Count("comments")
+    ).exclude(comment_count=F("total")).exists(), (
+        "Убедитесь, что после генерации данных счётчики комментариев "
+        "совпадают с реальным числом комментариев."
+    )
+
+
+def test_seed_benchmark_is_reproducible():
+    seed(seed=42)
+    first = list(Post.objects.order_by("pk").values_list("title", flat=True))
+    with pytest.raises(CommandError):
+        seed(seed=42)
+    User.objects.all().delete()
+    Category.objects.all().delete()
+    seed(seed=42)
+    assert list(
+        Post.objects.order_by("pk").values_list("title", flat=True)
+    ) == first, "Убедитесь, что одинаковое зерно даёт одинаковые данные."
+
+
+def test_seed_benchmark_resets_cached_pages(client):
+    assert 'href="/posts/' not in client.get("/").content.decode()
+    seed()
+    assert 'href="/posts/' in client.get("/").content.decode(), (
+        "Убедитесь, что после генерации данных закешированные страницы "
+        "сбрасываются."
+    )
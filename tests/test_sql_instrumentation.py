@@ -0,0 +1,77 @@
+import json
+import logging
+
+import pytest
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from blog.middleware import (
+    MetricsMiddleware,
+    QueryInstrumentationMiddleware
+)
+from blog.models import User
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def instrumentation(settings):
+    settings.BLOG_SQL_INSTRUMENTATION = True
+    settings.BLOG_SQL_DUPLICATE_THRESHOLD = 3
+    settings.BLOG_PAGE_CACHE_TIMEOUT = 0
+
+
+def test_server_timing_and_log(client, caplog, post_with_published_location):
+    with caplog.at_level(logging.INFO, logger="blog.sql"):
+        response = client.get("/")
+    assert response["Server-Timing"].startswith("db;desc=\""), (
+        "Убедитесь, что при включённой настройке BLOG_SQL_INSTRUMENTATION "
+        "ответ содержит заголовок `Server-Timing` с временем работы базы."
+    )
+    record = json.loads(caplog.records[0].getMessage())
+    assert record["view_name"] == "blog:index"
+    assert record["queries"] > 0
+    assert f'"{record["queries"]} queries"' in response["Server-Timing"]
+
+
+def test_duplicate_queries_are_flagged(caplog, user, another_user):
+    def view(request):
+        for pk in (user.pk, another_user.pk, user.pk):
+            User.objects.filter(pk=pk).first()
+        return HttpResponse()
+
+    middleware = QueryInstrumentationMiddleware(view)
+    with caplog.at_level(logging.INFO, logger="blog.sql"):
+        middleware(RequestFactory().get("/"))
+    record = json.loads(caplog.records[0].getMessage())
+    assert [item["count"] for item in record["duplicates"]] == [3]
+    assert any(
+        "N+1" in item.getMessage() for item in caplog.records
+        if item.levelno == logging.WARNING
+    ), "Убедитесь, что повторяющиеся запросы помечаются как проблема N+1."
+
+
+def test_queries_are_wrapped_once(settings, tmp_path, user):
+    settings.BLOG_METRICS = True
+    settings.BLOG_METRICS_DIR = tmp_path
+    wrappers = []
+
+    def view(request):
+        wrappers.append(len(connection.execute_wrappers))
+        User.objects.filter(pk=user.pk).first()
+        return HttpResponse()
+
+    middleware = MetricsMiddleware(QueryInstrumentationMiddleware(view))
+    request = RequestFactory().get("/")
+    middleware(request)
+    assert wrappers == [1], (
+        "Убедитесь, что при включённых метриках и инструментировании "
+        "SQL-запросы оборачиваются один раз."
+    )
+    assert request.query_stats.count == 1
+
+
+def test_disabled_by_setting(settings, client):
+    settings.BLOG_SQL_INSTRUMENTATION = False
+    assert not client.get("/").has_header("Server-Timing")
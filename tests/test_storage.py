@@ -0,0 +1,106 @@
+import hashlib
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from PIL import Image
+from django.core.files.base import ContentFile
+from django.core.files.images import ImageFile
+from django.core.files.storage import FileSystemStorage
+
+pytestmark = [pytest.mark.django_db]
+
+
+def make_image_file(name, color=(73, 109, 137)):
+    img_io = BytesIO()
+    Image.new("RGB", (100, 100), color=color).save(img_io, format="JPEG")
+    return ImageFile(img_io, name=name)
+
+
+def test_identical_uploads_are_deduplicated(mixer, user):
+    first = mixer.blend(
+        "blog.Post", author=user, image=make_image_file("first.JPG")
+    )
+    second = mixer.blend(
+        "blog.Post", author=user, image=make_image_file("second.jpg")
+    )
+    other = mixer.blend(
+        "blog.Post", author=user,
+        image=make_image_file("other.jpg", color=(0, 0, 0)),
+    )
+    assert first.image.name == second.image.name, (
+        "Убедитесь, что одинаковые изображения сохраняются в один файл."
+    )
+    assert other.image.name != first.image.name
+    with first.image.storage.open(first.image.name) as file:
+        digest = hashlib.sha256(file.read()).hexdigest()
+    assert first.image.name == f"post_images/{digest[:2]}/{digest}.jpg", (
+        "Убедитесь, что имя файла изображения совпадает с SHA-256 его "
+        "содержимого."
+    )
+
+
+def test_thumbnails_for_legacy_image_names(mixer, user):
+    from blog.images import get_image_sources, make_thumbnails
+
+    post = mixer.blend("blog.Post", author=user)
+    storage = post.image.storage
+    img_io = BytesIO()
+    Image.new("RGB", (800, 600)).save(img_io, format="JPEG")
+    legacy_name = "post_images/legacy.jpg"
+    if storage.exists(legacy_name):
+        storage.delete(legacy_name)
+    FileSystemStorage._save(storage, legacy_name, ContentFile(
+        img_io.getvalue()
+    ))
+    post.image.name = legacy_name
+    created = []
+    try:
+        created = make_thumbnails(post.image)
+        assert "post_images/legacy_320w.jpg" in created, (
+            "Убедитесь, что уменьшенные копии изображений, загруженных до "
+            "перехода на хранение по хешу, сохраняются под своими именами."
+        )
+        assert "320w" in get_image_sources(post.image)[None]
+        assert make_thumbnails(post.image) == []
+    finally:
+        for name in [legacy_name, *created]:
+            storage.delete(name)
+
+
+def test_failed_upload_leaves_no_temp_file(user):
+    from blog.storage import post_image_storage
+
+    class BrokenFile(ContentFile):
+        def chunks(self, chunk_size=None):
+            yield b"data"
+            raise OSError("обрыв загрузки")
+
+    storage = post_image_storage()
+    directory = Path(storage.path("post_images"))
+    before = set(directory.glob(".upload-*"))
+    with pytest.raises(OSError):
+        storage.save("post_images/broken.jpg", BrokenFile(b""))
+    assert set(directory.glob(".upload-*")) == before, (
+        "Убедитесь, что временный файл удаляется при ошибке загрузки."
+    )
+
+
+def test_derived_file_replaces_existing(monkeypatch, user):
+    from blog.storage import post_image_storage
+
+    storage = post_image_storage()
+    name = "post_images/derived_320w.jpg"
+    storage.save_derived(name, ContentFile(b"old"))
+    # Другой обработчик пересоздал копию: файл снова на месте.
+    monkeypatch.setattr(storage, "delete", lambda name: None)
+    try:
+        assert storage.save_derived(name, ContentFile(b"new")) == name
+        with storage.open(name) as file:
+            assert file.read() == b"new", (
+                "Убедитесь, что производный файл заменяет существующий, "
+                "даже если тот появился во время сохранения."
+            )
+    finally:
+        monkeypatch.undo()
+        storage.delete(name)
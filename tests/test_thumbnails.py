@@ -0,0 +1,137 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+
+from blog.images import (
+    get_thumbnail_name,
+    get_thumbnail_names,
+    make_thumbnails
+)
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def post_with_large_image(mixer, user, published_category):
+    img_io = BytesIO()
+    Image.new("RGB", (800, 600), color=(73, 109, 137)).save(
+        img_io, format="JPEG"
+    )
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, image=ImageFile(img_io, name="large.jpg"),
+    )
+    call_command("runworker", once=True, processes=1)
+    return post
+
+
+def get_existing_thumbnails(post):
+    storage = post.image.storage
+    return {
+        width: name
+        for width, name in get_thumbnail_names(post.image).items()
+        if storage.exists(name)
+    }
+
+
+def test_thumbnails_created_on_upload(post_with_large_image):
+    thumbnails = get_existing_thumbnails(post_with_large_image)
+    assert set(thumbnails) == {320, 640}, (
+        "Убедитесь, что при загрузке изображения создаются уменьшенные "
+        "копии, не превышающие ширину оригинала."
+    )
+    with post_with_large_image.image.storage.open(thumbnails[320]) as file:
+        assert Image.open(file).size == (320, 240)
+    srcset = post_with_large_image.image_srcset
+    assert "320w" in srcset and "640w" in srcset
+
+
+def test_webp_variants_created_on_upload(post_with_large_image):
+    storage = post_with_large_image.image.storage
+    names = get_thumbnail_names(post_with_large_image.image, "webp")
+    assert storage.exists(names[320]) and storage.exists(names[640]), (
+        "Убедитесь, что при загрузке изображения создаются копии в WebP."
+    )
+    with storage.open(names[640]) as file:
+        assert Image.open(file).format == "WEBP"
+
+
+def test_full_size_reencoded(post_with_large_image):
+    storage = post_with_large_image.image.storage
+    name = get_thumbnail_name(post_with_large_image.image.name, 800, "webp")
+    assert storage.exists(name), (
+        "Убедитесь, что оригинал перекодируется в WebP в полном размере."
+    )
+    with storage.open(name) as file:
+        assert Image.open(file).size == (800, 600)
+    sources = {
+        source["type"]: source["srcset"]
+        for source in post_with_large_image.image_sources
+    }
+    assert "800w" in sources["image/webp"]
+
+
+def test_narrow_image_gets_modern_format(user_client, blend_published_post):
+    img_io = BytesIO()
+    Image.new("RGB", (200, 150)).save(img_io, format="JPEG")
+    post = blend_published_post(image=ImageFile(img_io, name="narrow.jpg"))
+    call_command("runworker", once=True, processes=1)
+    content = user_client.get(f"/posts/{post.id}/").content.decode()
+    assert '<source type="image/webp"' in content, (
+        "Убедитесь, что изображения уже 320 пикселей тоже получают "
+        "источник в современном формате."
+    )
+
+
+def test_thumbnails_in_templates(user_client, post_with_large_image):
+    content = user_client.get(
+        f"/posts/{post_with_large_image.id}/"
+    ).content.decode("utf-8")
+    assert 'srcset="' in content, (
+        "Убедитесь, что изображение публикации выводится с атрибутом "
+        "`srcset`."
+    )
+    assert '<source type="image/webp"' in content, (
+        "Убедитесь, что изображение публикации выводится в `<picture>` "
+        "с источником WebP."
+    )
+
+
+def test_make_thumbnails_command(post_with_large_image):
+    storage = post_with_large_image.image.storage
+    for name in get_existing_thumbnails(post_with_large_image).values():
+        storage.delete(name)
+    call_command("make_thumbnails")
+    assert set(get_existing_thumbnails(post_with_large_image)) == {320, 640}
+
+
+def test_each_width_is_resized_once(monkeypatch, post_with_large_image):
+    resized = []
+    resize = Image.Image.resize
+
+    def counting_resize(self, size, *args, **kwargs):
+        resized.append(size)
+        return resize(self, size, *args, **kwargs)
+
+    monkeypatch.setattr(Image.Image, "resize", counting_resize)
+    make_thumbnails(post_with_large_image.image, force=True)
+    assert sorted(resized) == [(320, 240), (640, 480)], (
+        "Убедитесь, что изображение масштабируется один раз на каждую "
+        "ширину, а не отдельно для каждого формата."
+    )
+
+
+def test_cached_pages_refresh_after_thumbnails(
+        client, blend_published_post):
+    img_io = BytesIO()
+    Image.new("RGB", (800, 600)).save(img_io, format="JPEG")
+    blend_published_post(image=ImageFile(img_io, name="fresh.jpg"))
+    assert "srcset=" not in client.get("/").content.decode()
+    call_command("runworker", once=True, processes=1)
+    assert "srcset=" in client.get("/").content.decode(), (
+        "Убедитесь, что после создания уменьшенных копий закешированные "
+        "страницы и карточки постов обновляются."
+    )